@@ -0,0 +1,243 @@
+"""Microbenchmarks of the record and output hot paths.
+
+Run from the repository root:
+
+    python benchmarks/bench.py
+    python benchmarks/bench.py --output results.json
+    python benchmarks/bench.py --baseline benchmarks/baseline.json
+    python benchmarks/bench.py --save benchmarks/baseline.json
+
+Each case is repeated several times and the best time per operation is
+taken. When baseline is given every case is compared with it and the script
+exits with code 1 if any case is slower than the baseline by more than the
+threshold.
+"""
+
+import argparse
+import contextlib
+import datetime as dt
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pypyrus_logbook as logbook
+
+from pypyrus_logbook.record import Record
+
+rich_format = ('{isodate}\t{rectype}\t{thread}\t{flname}\t{objname}\t'
+               '{lineno}\t{div}\t{message}\n')
+counter = 0
+
+
+def new_logger(**kwargs):
+    """Create new independent logger with outputs disabled by default."""
+    global counter
+    counter += 1
+    options = dict(console=False, file=False, control=False)
+    options.update(kwargs)
+    return logbook.Logger(name=f'bench-{counter}', **options)
+
+
+@contextlib.contextmanager
+def devnull():
+    """Redirect standard output to the null device."""
+    stdout = sys.stdout
+    with open(os.devnull, 'w') as fh:
+        sys.stdout = fh
+        try:
+            yield
+        finally:
+            sys.stdout = stdout
+
+
+def case_record_default(tmp):
+    logger = new_logger()
+    return lambda: Record(logger, 'info', 'message {n}', n=1)
+
+
+def case_record_rich(tmp):
+    logger = new_logger(format=rich_format)
+    return lambda: Record(logger, 'info', 'message {n}', n=1)
+
+
+def case_record_create(tmp):
+    logger = new_logger(format=rich_format)
+    return lambda: Record(logger, 'info', 'message {n}', n=1).create()
+
+
+def case_record_serialize(tmp):
+    logger = new_logger()
+    return lambda: Record(logger, 'info', 'message {n}', n=1).serialize()
+
+
+def case_serialize_forms(tmp):
+    logger = new_logger()
+    record = Record(logger, 'info', 'message {n}', n=1, tags=['a', 'b'],
+                    user={'id': 1, 'name': 'user'})
+    return record.serialize
+
+
+def case_json_dumps_forms(tmp):
+    # Reference for serialize_forms: the same fields encoded by json.dumps.
+    logger = new_logger()
+    record = Record(logger, 'info', 'message {n}', n=1, tags=['a', 'b'],
+                    user={'id': 1, 'name': 'user'})
+
+    def func():
+        fields = {'datetime': record.datetime.isoformat(),
+                  'rectype': record.rectype, 'objname': record.objname,
+                  'flname': record.flname, 'thread': record.thread,
+                  'message': record.message, **record.forms}
+        return json.dumps(fields, ensure_ascii=False, default=str) + '\n'
+    return func
+
+
+def case_logger_filtered(tmp):
+    logger = new_logger(debug=False)
+    return lambda: logger.debug('message {n}', n=1)
+
+
+def case_logger_unfiltered(tmp):
+    logger = new_logger()
+    return lambda: logger.info('message {n}', n=1)
+
+
+def case_recorder_capture(tmp):
+    logger = new_logger(debug=False, recorder=True)
+    return lambda: logger.debug('message {n}', n=1)
+
+
+def case_root_write_console(tmp):
+    logger = new_logger(console=True)
+    record = Record(logger, 'info', 'message')
+    return lambda: logger.root.write(record)
+
+
+def case_file_write(tmp):
+    logger = new_logger(file=True, directory=tmp, maxsize=False)
+    string = Record(logger, 'info', 'message').create()
+    return lambda: logger.root.file.write(string)
+
+
+def case_error_traceback(tmp):
+    logger = new_logger(file=True, directory=tmp, maxsize=False)
+
+    def func():
+        try:
+            1/0
+        except ZeroDivisionError:
+            logger.error()
+    return func
+
+
+def case_header_create(tmp):
+    logger = new_logger()
+    return logger.header.create
+
+
+def case_logger_construct(tmp):
+    return new_logger
+
+
+cases = {'record_default': case_record_default,
+         'record_rich': case_record_rich,
+         'record_create': case_record_create,
+         'record_serialize': case_record_serialize,
+         'serialize_forms': case_serialize_forms,
+         'json_dumps_forms': case_json_dumps_forms,
+         'logger_filtered': case_logger_filtered,
+         'logger_unfiltered': case_logger_unfiltered,
+         'recorder_capture': case_recorder_capture,
+         'root_write_console': case_root_write_console,
+         'file_write': case_file_write,
+         'error_traceback': case_error_traceback,
+         'header_create': case_header_create,
+         'logger_construct': case_logger_construct}
+
+
+def measure(func, repeat, duration):
+    """Return the best time of one call in nanoseconds."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * duration / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1e9, number
+
+
+def run(names, repeat, duration):
+    """Run the cases and return the results."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, devnull():
+        for name in names:
+            func = cases[name](tmp)
+            ns, number = measure(func, repeat, duration)
+            results[name] = {'ns': round(ns, 1), 'number': number}
+    return {'date': dt.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'results': results}
+
+
+def compare(results, baseline, threshold):
+    """Print the comparison with baseline and return regressed cases."""
+    regressions = []
+    print(f'{"CASE":<20} {"NS/OP":>12} {"BASELINE":>12} {"RATIO":>8}')
+    for name, result in results['results'].items():
+        base = baseline['results'].get(name, {}).get('ns')
+        if base is None:
+            print(f'{name:<20} {result["ns"]:>12.1f} {"-":>12} {"-":>8}')
+            continue
+        ratio = result['ns'] / base
+        mark = ''
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            mark = ' REGRESSION'
+        print(f'{name:<20} {result["ns"]:>12.1f} {base:>12.1f} '
+              f'{ratio:>8.2f}{mark}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('cases', nargs='*', help='cases to run, all by '
+                                                 'default')
+    parser.add_argument('--output', help='path to JSON file with results')
+    parser.add_argument('--baseline', help='path to JSON file with baseline')
+    parser.add_argument('--save', help='path to save results as baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed slowdown against baseline, default is '
+                             '0.2 which means 20%%')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of repeats of each case')
+    parser.add_argument('--duration', type=float, default=0.2,
+                        help='approximate duration of one repeat in seconds')
+    args = parser.parse_args()
+
+    names = args.cases or list(cases)
+    results = run(names, args.repeat, args.duration)
+    text = json.dumps(results, indent=2)
+
+    for path in (args.output, args.save):
+        if path is not None:
+            with open(path, 'w') as fh:
+                fh.write(text + '\n')
+
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as fh:
+            baseline = json.load(fh)
+        regressions = compare(results, baseline, args.threshold)
+        if len(regressions) > 0:
+            print(f'Regressions: {", ".join(regressions)}')
+            sys.exit(1)
+    elif args.output is None and args.save is None:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
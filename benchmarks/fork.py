@@ -0,0 +1,194 @@
+"""Fork safety harness for logging under load.
+
+Run from the repository root:
+
+    python benchmarks/fork.py
+    python benchmarks/fork.py --children 50 --threads 4 --deferred
+    python benchmarks/fork.py --maxsize 65536 --output fork.json
+
+Parent process writes records from several threads and at the same time
+forks children one by one like pre-fork servers do. Each child writes its
+own records from several threads to the logger inherited from the parent and
+exits. Children that do not finish in time are killed and reported as hung.
+When run is finished all files are read back to find lost, duplicated and
+torn lines. Only POSIX systems are supported.
+"""
+
+import argparse
+import json
+import os
+import re
+import signal
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pypyrus_logbook as logbook
+
+payload = 'x'*64
+pattern = re.compile(r'^\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\tINFO\t'
+                     r'p(\d+)-(\d+)-(\d+) ' + payload + r'$')
+
+
+def work(logger, process, thread, count, stop=None, rate=0):
+    """Write records from one thread. Parent threads write at the target
+    rate until stopped.
+    """
+    interval = 1/rate if rate > 0 else 0
+    start = time.perf_counter()
+    seq = 0
+    while seq < count or (stop is not None and stop.is_set() is False):
+        if interval > 0:
+            delay = start + seq*interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        logger.info(f'p{process}-{thread}-{seq} {payload}')
+        seq += 1
+    return seq
+
+
+def run_child(logger, process, args):
+    """Write records from the threads of the child and exit."""
+    threads = [threading.Thread(target=work,
+                                args=(logger, process, i, args.count))
+               for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logger.close()
+
+
+def wait(pid, timeout):
+    """Wait for the child and return True if it exited successfully."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done != 0:
+            return os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+        time.sleep(0.01)
+    os.kill(pid, signal.SIGKILL)
+    os.waitpid(pid, 0)
+    return None
+
+
+def verify(directory, keys):
+    """Read all files back and count lost, duplicated and torn lines."""
+    seen = set()
+    lines = duplicates = torn = files = 0
+    for name in os.listdir(directory):
+        if name.endswith('.log') is False:
+            continue
+        files += 1
+        with open(os.path.join(directory, name), 'r', errors='replace') as fh:
+            for line in fh:
+                lines += 1
+                match = pattern.match(line.rstrip('\n'))
+                if match is None:
+                    torn += 1
+                    continue
+                key = match.group(1, 2, 3)
+                if key in seen:
+                    duplicates += 1
+                seen.add(key)
+    return {'files': files, 'lines': lines, 'expected': len(keys),
+            'lost': len(keys-seen), 'duplicated': duplicates, 'torn': torn}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--children', type=int, default=20,
+                        help='number of forked children')
+    parser.add_argument('--threads', type=int, default=2,
+                        help='number of threads in the parent and in each '
+                             'child')
+    parser.add_argument('--count', type=int, default=2000,
+                        help='number of records written by each thread of '
+                             'the child')
+    parser.add_argument('--rate', type=float, default=2000,
+                        help='target rate of records per second for each '
+                             'thread of the parent, zero means unlimited')
+    parser.add_argument('--maxsize', type=int, default=256*1024,
+                        help='maximum size of the file before rotation')
+    parser.add_argument('--deferred', action='store_true',
+                        help='write records by the background writer')
+    parser.add_argument('--timeout', type=float, default=30,
+                        help='seconds given to each child to finish')
+    parser.add_argument('--directory',
+                        help='folder for log files, temporary by default')
+    parser.add_argument('--output', help='path to JSON file with report')
+    args = parser.parse_args()
+
+    if hasattr(os, 'fork') is False:
+        parser.error('fork is not supported on this platform')
+
+    temp = None
+    if args.directory is None:
+        temp = tempfile.TemporaryDirectory()
+        args.directory = temp.name
+
+    logger = logbook.Logger(name='fork', console=False,
+                            directory=args.directory, filename='fork',
+                            maxsize=args.maxsize, maxdays=False,
+                            control=False, alarming=False,
+                            deferred=args.deferred)
+
+    # Parent threads write during all the forks.
+    stop = threading.Event()
+    written = {}
+
+    def parent_work(thread):
+        written[thread] = work(logger, 0, thread, 0, stop, args.rate)
+
+    threads = [threading.Thread(target=parent_work, args=(i,))
+               for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+
+    start = time.perf_counter()
+    results = []
+    for process in range(1, args.children+1):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                run_child(logger, process, args)
+                code = 0
+            finally:
+                os._exit(code)
+        results.append(wait(pid, args.timeout))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for thread in threads:
+        thread.join()
+    logger.close()
+
+    keys = {('0', str(thread), str(seq))
+            for thread, count in written.items() for seq in range(count)}
+    keys |= {(str(process), str(thread), str(seq))
+             for process in range(1, args.children+1)
+             for thread in range(args.threads) for seq in range(args.count)}
+    report = {'children': args.children, 'threads': args.threads,
+              'count': args.count, 'rate': args.rate,
+              'deferred': args.deferred,
+              'maxsize': args.maxsize, 'seconds': round(elapsed, 3),
+              'forks_per_second': round(args.children/elapsed, 1),
+              'succeeded': results.count(True),
+              'failed': results.count(False),
+              'hung': results.count(None),
+              'verification': verify(args.directory, keys)}
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        with open(args.output, 'w') as fh:
+            fh.write(text + '\n')
+    print(text)
+
+    if temp is not None:
+        temp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
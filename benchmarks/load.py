@@ -0,0 +1,210 @@
+"""Load harness for concurrent logging to file.
+
+Run from the repository root:
+
+    python benchmarks/load.py --threads 8
+    python benchmarks/load.py --threads 4 --processes 4 --rate 2000
+    python benchmarks/load.py --threads 32 --maxsize 65536 --output load.json
+
+Each worker thread writes records with unique identifiers at the target
+rate. Small `maxsize` makes the logger rotate files during the run. When run
+is finished all files are read back to find lost, duplicated and torn lines.
+Report contains throughput, call latency percentiles and peak RSS. No outside
+services are required.
+"""
+
+import argparse
+import datetime as dt
+import json
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import pypyrus_logbook as logbook
+
+payload = 'x'*64
+pattern = re.compile(r'^\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\t(INFO|ERROR)\t'
+                     r'w(\d+)-(\d+)-(\d+) ' + payload + r'$')
+
+
+def work(logger, process, thread, count, rate, errors, latencies, failures):
+    """Write records from one thread and collect call latencies.
+    Exceptions raised by the logger are collected instead of stopping the
+    thread.
+    """
+    interval = 1/rate if rate > 0 else 0
+    every = int(1/errors) if errors > 0 else 0
+    start = time.perf_counter()
+    clock = time.perf_counter_ns
+    for seq in range(count):
+        if interval > 0:
+            delay = start + seq*interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        message = f'w{process}-{thread}-{seq} {payload}'
+        begin = clock()
+        try:
+            if every > 0 and seq % every == 0:
+                logger.error(message)
+            else:
+                logger.info(message)
+        except Exception as error:
+            failures.append(repr(error))
+        latencies.append(clock()-begin)
+    pass
+
+
+def run_process(process, args, queue=None):
+    """Run all threads of one process and return their latencies and
+    failures.
+    """
+    logger = logbook.Logger(name=f'load-{process}', console=False,
+                            directory=args.directory, maxsize=args.maxsize,
+                            maxdays=args.maxdays, control=False,
+                            alarming=False)
+    latencies, failures = [], []
+    threads = [threading.Thread(target=work,
+                                args=(logger, process, i, args.count,
+                                      args.rate, args.errors, latencies,
+                                      failures))
+               for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if queue is not None:
+        queue.put((latencies, failures, peak_rss()))
+    return latencies, failures
+
+
+def peak_rss():
+    """Return peak RSS of the current process in megabytes."""
+    if resource is None:
+        return None
+    value = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS reports bytes.
+    return value/1024 if sys.platform != 'darwin' else value/1024/1024
+
+
+def verify(directory, processes, threads, count):
+    """Read all files back and count lost, duplicated and torn lines."""
+    seen = set()
+    lines = duplicates = torn = files = 0
+    for name in os.listdir(directory):
+        if name.endswith('.log') is False:
+            continue
+        files += 1
+        with open(os.path.join(directory, name), 'r', errors='replace') as fh:
+            for line in fh:
+                lines += 1
+                match = pattern.match(line.rstrip('\n'))
+                if match is None:
+                    torn += 1
+                    continue
+                key = match.group(2, 3, 4)
+                if key in seen:
+                    duplicates += 1
+                seen.add(key)
+    expected = max(processes, 1)*threads*count
+    return {'files': files, 'lines': lines, 'expected': expected,
+            'lost': expected-len(seen), 'duplicated': duplicates,
+            'torn': torn}
+
+
+def percentile(values, share):
+    """Return the percentile of sorted values in microseconds."""
+    if len(values) == 0:
+        return None
+    index = min(int(len(values)*share), len(values)-1)
+    return round(values[index]/1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=4,
+                        help='number of threads in each process')
+    parser.add_argument('--processes', type=int, default=0,
+                        help='number of processes, zero means that threads '
+                             'are run in the current process')
+    parser.add_argument('--count', type=int, default=10000,
+                        help='number of records written by each thread')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='target rate of records per second for each '
+                             'thread, zero means unlimited')
+    parser.add_argument('--errors', type=float, default=0.01,
+                        help='share of records written as errors')
+    parser.add_argument('--maxsize', type=int, default=256*1024,
+                        help='maximum size of the file before rotation')
+    parser.add_argument('--maxdays', type=int, default=1,
+                        help='maximum number of days logged to one file')
+    parser.add_argument('--directory',
+                        help='folder for log files, temporary by default')
+    parser.add_argument('--output', help='path to JSON file with report')
+    args = parser.parse_args()
+
+    temp = None
+    if args.directory is None:
+        temp = tempfile.TemporaryDirectory()
+        args.directory = temp.name
+
+    start = time.perf_counter()
+    rss = []
+    if args.processes > 0:
+        queue = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=run_process,
+                                             args=(i, args, queue))
+                     for i in range(args.processes)]
+        for process in processes:
+            process.start()
+        latencies, failures = [], []
+        for process in processes:
+            values, errors, value = queue.get()
+            latencies.extend(values)
+            failures.extend(errors)
+            rss.append(value)
+        for process in processes:
+            process.join()
+    else:
+        latencies, failures = run_process(0, args)
+    elapsed = time.perf_counter() - start
+    rss.append(peak_rss())
+
+    latencies.sort()
+    report = {'date': dt.datetime.now().isoformat(timespec='seconds'),
+              'threads': args.threads, 'processes': args.processes,
+              'count': args.count, 'rate': args.rate,
+              'maxsize': args.maxsize, 'seconds': round(elapsed, 3),
+              'throughput': round(len(latencies)/elapsed, 1),
+              'latency_us': {'p50': percentile(latencies, 0.5),
+                             'p99': percentile(latencies, 0.99),
+                             'p999': percentile(latencies, 0.999),
+                             'max': percentile(latencies, 1)},
+              'failures': len(failures),
+              'failure_samples': sorted(set(failures))[:5],
+              'peak_rss_mb': max([value for value in rss
+                                  if value is not None], default=None),
+              'verification': verify(args.directory, args.processes,
+                                     args.threads, args.count)}
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        with open(args.output, 'w') as fh:
+            fh.write(text + '\n')
+    print(text)
+
+    if temp is not None:
+        temp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
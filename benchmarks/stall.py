@@ -0,0 +1,99 @@
+"""Event loop stall measurement for synchronous and asynchronous logging.
+
+Run from the repository root:
+
+    python benchmarks/stall.py
+    python benchmarks/stall.py --count 50000 --batch 50 --output stall.json
+
+Producer task writes records to the file output in batches and yields to the
+event loop after each batch. Ticker task sleeps for the short interval and
+measures how late it wakes up. Lateness of the ticker is the stall of the
+event loop. Run is done twice: with `Logger.info` and with `Logger.ainfo`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pypyrus_logbook as logbook
+
+payload = 'x'*64
+
+
+async def ticker(interval, stalls, done):
+    """Sleep for the interval and collect the lateness of wake up."""
+    while done.is_set() is False:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(time.perf_counter() - start - interval)
+
+
+async def producer(logger, mode, count, batch):
+    """Write records in batches and yield to the event loop after each."""
+    for seq in range(count):
+        if mode == 'async':
+            await logger.ainfo(f'{seq} {payload}')
+        else:
+            logger.info(f'{seq} {payload}')
+        if seq % batch == 0:
+            await asyncio.sleep(0)
+    if mode == 'async':
+        await logger.aclose()
+
+
+async def measure(logger, mode, args):
+    """Run producer and ticker together and return the statistics."""
+    stalls = []
+    done = asyncio.Event()
+    task = asyncio.ensure_future(ticker(args.interval, stalls, done))
+    start = time.perf_counter()
+    await producer(logger, mode, args.count, args.batch)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await task
+    stalls.sort()
+    def ms(share):
+        index = min(int(len(stalls)*share), len(stalls)-1)
+        return round(stalls[index]*1000, 3)
+    return {'seconds': round(elapsed, 3), 'ticks': len(stalls),
+            'stall_ms': {'p50': ms(0.5), 'p99': ms(0.99), 'max': ms(1)}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=20000,
+                        help='number of records in each run')
+    parser.add_argument('--batch', type=int, default=100,
+                        help='number of records between yields')
+    parser.add_argument('--interval', type=float, default=0.001,
+                        help='sleep interval of the ticker in seconds')
+    parser.add_argument('--output', help='path to JSON file with report')
+    args = parser.parse_args()
+
+    report = {'count': args.count, 'batch': args.batch}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ('sync', 'async'):
+            logger = logbook.Logger(name=f'stall-{mode}', console=False,
+                                    directory=tmp, maxsize=1024*1024,
+                                    control=False, alarming=False)
+            loop = asyncio.new_event_loop()
+            try:
+                report[mode] = loop.run_until_complete(measure(logger, mode,
+                                                               args))
+            finally:
+                loop.close()
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        with open(args.output, 'w') as fh:
+            fh.write(text + '\n')
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
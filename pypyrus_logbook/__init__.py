@@ -1,6 +1,9 @@
 from .conf import all_loggers
+from .filters import Sampler
+from .filters import filter_options
 from .formatter import Formatter
 from .header import Header
+from .logger import Child
 from .logger import Logger
 from .output import Output
 from .record import Record
@@ -21,6 +24,10 @@ __doc__ = 'Module for extended logging in Python.'
 def logger(name=None, **kwargs):
     """Get new logger or return existing one.
     If parameter name is omitted then return main application logger.
+    If parameter name is dotted and one of its prefixes is the name of
+    existing logger then child of that logger is returned. Child shares the
+    outputs of its parent so it is returned only when nothing but record
+    type filters is given, otherwise new independent logger is created.
     All other named parameters will be used for configuration.
 
     Parameters
@@ -36,12 +43,30 @@ def logger(name=None, **kwargs):
         The `Logger` object.
     """
     name = name or py_file
-    if all_loggers.get(name) is not None:
+    logger = all_loggers.get(name)
+    if logger is not None:
         if len(kwargs) > 0:
-            all_loggers[name].configure(**kwargs)
-        return all_loggers[name]
-    else:
+            if isinstance(logger, Child) is True:
+                other = set(kwargs) - filter_options
+                if len(other) > 0:
+                    raise ValueError(f'child logger {name} shares outputs '
+                                     f'of its parent and can not be '
+                                     f'configured with {sorted(other)}')
+            logger.configure(**kwargs)
+        return logger
+    if len(set(kwargs) - filter_options) > 0:
         return Logger(name=name, **kwargs)
+    # Find the nearest existing parent.
+    parent = name
+    while '.' in parent:
+        parent = parent.rsplit('.', 1)[0]
+        logger = all_loggers.get(parent)
+        if logger is not None:
+            child = logger.child(name[len(parent)+1:])
+            if len(kwargs) > 0:
+                child.configure(**kwargs)
+            return child
+    return Logger(name=name, **kwargs)
 
 getlogger = logger
 
@@ -1 +1,80 @@
-all_loggers = {}
+import collections.abc
+import weakref
+
+
+class Registry(collections.abc.MutableMapping):
+    """This class represents the registry of loggers by their names.
+
+    By default registry keeps strong references so each logger lives until
+    the end of the program. In weak mode registry keeps only weak
+    references so logger which is no longer used by the application is
+    collected together with its outputs and disappears from the registry.
+    Weak mode is useful when many short-lived loggers are created, for
+    example one for each job.
+
+    Registry also keeps the set of loggers that are not closed yet, in the
+    same mode, so they are finished at the end of the program. It includes
+    the loggers replaced in the registry by new ones with the same name.
+
+    Parameters
+    ----------
+    weak : bool, optional
+        The argument is used to set `weak` attribute.
+
+    Attributes
+    ----------
+    weak : bool
+        The registry mode. Existing items are moved when it is changed.
+    live : set or weakref.WeakSet
+        The loggers that are not closed yet.
+    """
+
+    def __init__(self, weak=False):
+        self._items = weakref.WeakValueDictionary() if weak is True else {}
+        self.live = weakref.WeakSet() if weak is True else set()
+        pass
+
+    @property
+    def weak(self):
+        """Is registry keeps only weak references."""
+        return isinstance(self._items, weakref.WeakValueDictionary)
+
+    @weak.setter
+    def weak(self, value):
+        if value is True and self.weak is False:
+            self._items = weakref.WeakValueDictionary(self._items)
+            self.live = weakref.WeakSet(self.live)
+        elif value is False and self.weak is True:
+            self._items = dict(self._items.items())
+            self.live = set(self.live)
+        pass
+
+    def __getitem__(self, name):
+        return self._items[name]
+
+    def __setitem__(self, name, logger):
+        self._items[name] = logger
+        pass
+
+    def __delitem__(self, name):
+        del self._items[name]
+        pass
+
+    def __iter__(self):
+        return iter(list(self._items.keys()))
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, name, default=None):
+        return self._items.get(name, default)
+
+    def values(self):
+        """List of registered loggers."""
+        return list(self._items.values())
+
+    def items(self):
+        """List of registered names and loggers."""
+        return list(self._items.items())
+
+all_loggers = Registry()
@@ -0,0 +1,558 @@
+import datetime as dt
+import random
+import threading
+import time
+import zlib
+
+from .record import Record
+from .record import catch_frame
+
+
+class Suppressor():
+    """This class represents suppressor - object that prevents the output
+    from being flooded by the same records.
+
+    Records are identified by the fingerprint made of record type, message,
+    user defined forms and the call site. First record with the fingerprint
+    opens the window and is written as usual. All the same records inside
+    the window are only counted. When window is closed the summary record
+    with the number of repeats is written. Summary has the call site and
+    thread of the first record. Windows with repeats are closed by the
+    background timer so summary is written in time even when no more
+    records come.
+
+    Parameters
+    ----------
+    logger : Logger
+        The argument is used to set `logger` attribute.
+    window : int or float, optional
+        The argument is used to set `window` attribute.
+
+    Attributes
+    ----------
+    logger : Logger
+        The `Logger` object that owns that suppressor.
+    window : int or float
+        The length of the window in seconds. The default is 10.
+    entries : dict
+        The open windows. Keys are fingerprints and values are lists with the
+        time of window end, number of repeats, record type, message, user
+        defined forms, code object, line number and thread name of the
+        first record.
+    """
+
+    def __init__(self, logger, window=None):
+        self.logger = logger
+        self.window = window or 10
+        self.entries = {}
+        self._sweep_date = 0
+        self._timer = None
+        self._lock = threading.RLock()
+        pass
+
+    def _after_fork(self):
+        """Create new lock in the child process. Timer thread stays in the
+        parent process.
+        """
+        self._lock = threading.RLock()
+        self._timer = None
+        pass
+
+    def check(self, rectype, message, kwargs):
+        """Check whether record must be written or only counted.
+
+        Parameters
+        ----------
+        rectype : str
+            The type of record.
+        message : str
+            The message of record.
+        kwargs : dict
+            The user defined forms of record.
+
+        Returns
+        -------
+        result : bool
+            True if record must be written and False if it is suppressed.
+        """
+        now = time.monotonic()
+        if now >= self._sweep_date:
+            self.sweep(now)
+
+        frame = catch_frame()
+        code, lineno = frame.f_code, frame.f_lineno
+        key = (rectype, message, code, lineno)
+        if kwargs:
+            key += tuple(sorted(kwargs.items()))
+        with self._lock:
+            try:
+                entry = self.entries.get(key)
+            except TypeError:
+                # Unhashable forms can not be fingerprinted.
+                return True
+            if entry is not None and now < entry[0]:
+                entry[1] += 1
+                if self._timer is None:
+                    self.__schedule(entry[0] - now)
+                return False
+            self.entries[key] = [now + self.window, 0, rectype, message,
+                                 kwargs, code, lineno,
+                                 threading.current_thread().name]
+        if entry is not None:
+            self.summarize(entry)
+        return True
+
+    def sweep(self, now=None):
+        """Close all expired windows and write their summaries.
+
+        Parameters
+        ----------
+        now : float, optional
+            The current value of monotonic clock.
+        """
+        now = now or time.monotonic()
+        with self._lock:
+            self._sweep_date = now + min(self.window, 1)
+            expired = [self.entries.pop(key)
+                       for key, entry in list(self.entries.items())
+                       if now >= entry[0]]
+        for entry in expired:
+            self.summarize(entry)
+        pass
+
+    def flush(self):
+        """Close all windows and write their summaries."""
+        with self._lock:
+            entries = list(self.entries.values())
+            self.entries.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for entry in entries:
+            self.summarize(entry)
+        pass
+
+    def __schedule(self, delay):
+        """Start the timer that closes the windows. Lock must be held."""
+        self._timer = threading.Timer(max(delay, 0), self.__expire)
+        self._timer.name = 'LogbookSuppressor'
+        self._timer.daemon = True
+        self._timer.start()
+        pass
+
+    def __expire(self):
+        """Close expired windows and wait for the next window with repeats.
+        """
+        now = time.monotonic()
+        self.sweep(now)
+        with self._lock:
+            self._timer = None
+            ends = [entry[0] for entry in self.entries.values()
+                    if entry[1] > 0]
+            if len(ends) > 0:
+                self.__schedule(min(ends) - now)
+        pass
+
+    def summarize(self, entry):
+        """Write the summary record of the window if there were repeats.
+
+        Parameters
+        ----------
+        entry : list
+            The window entry.
+        """
+        end, count, rectype, message, kwargs, code, lineno, thread = entry
+        if count > 0:
+            message = f'{message} [repeated {count} times]'
+            record = Record.restore(self.logger, time.time_ns(), rectype,
+                                    message, kwargs, code, lineno, thread)
+            self.logger.write(record)
+        pass
+
+class Throttle():
+    """This class represents throttle - object that limits the rate of
+    records sent from the same call site.
+
+    Call site is identified by the code object and the line of the caller
+    so each line of code is throttled separately. Check is done before the
+    record is created so throttled call costs only the frame walk and a
+    dictionary lookup.
+
+    Attributes
+    ----------
+    sites : dict
+        The states of call sites. Keys are pairs of code object and line
+        number and values are lists with the number of calls and the time of
+        the last written record.
+    """
+
+    def __init__(self):
+        self.sites = {}
+        self._lock = threading.Lock()
+        pass
+
+    def _after_fork(self):
+        """Create new lock in the child process."""
+        self._lock = threading.Lock()
+        pass
+
+    def check(self, every=None, every_seconds=None, once=False):
+        """Check whether record from the current call site must be written.
+
+        Parameters
+        ----------
+        every : int, optional
+            The argument is used to write only each N-th record starting
+            from the first one.
+        every_seconds : int or float, optional
+            The argument is used to write not more than one record in T
+            seconds.
+        once : bool, optional
+            The argument is used to write only the first record.
+
+        Returns
+        -------
+        result : bool
+            True if record must be written and False if it is throttled.
+        """
+        frame = catch_frame()
+        key = (frame.f_code, frame.f_lineno)
+        with self._lock:
+            site = self.sites.get(key)
+            if site is None:
+                site = self.sites[key] = [0, None]
+            count, last = site
+            site[0] = count + 1
+            if once is True and count > 0:
+                return False
+            if every is not None and count % every != 0:
+                return False
+            if every_seconds is not None:
+                now = time.monotonic()
+                if last is not None and now - last < every_seconds:
+                    return False
+                site[1] = now
+        return True
+
+filter_options = frozenset(('info', 'debug', 'warning', 'error',
+                            'critical'))
+
+class Filters(dict):
+    """This class represents record type filters of the logger - dictionary
+    where keys are record types and values are booleans or samplers.
+
+    Each change of the item is reported to the logger so its children are
+    resolved again. Lookups are done by the dictionary itself, so checking
+    the filter costs the same as in the plain dictionary.
+
+    Parameters
+    ----------
+    logger : Logger
+        The argument is used to set `logger` attribute.
+
+    Attributes
+    ----------
+    logger : Logger
+        The `Logger` object which records are filtered.
+    """
+
+    def __init__(self, logger):
+        super().__init__()
+        self.logger = logger
+        pass
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.logger._refilter(key, value)
+        pass
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.logger._refilter(key, None)
+        pass
+
+    def pop(self, key, *default):
+        value = super().pop(key, *default)
+        self.logger._refilter(key, None)
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+        pass
+
+class Sampler():
+    """This class represents sampler - the record type filter that passes
+    only a part of the records.
+
+    When `key` is defined and record has the user defined form with that
+    name then decision is made by the hash of its value. So all records with
+    the same value (e.g. the same request id) are either kept or dropped
+    together. In other case records are sampled randomly.
+
+    Sampler is used as a value in `Logger.filters` dictionary. Check is done
+    before the record is created.
+
+    Parameters
+    ----------
+    rate : float
+        The argument is used to set `rate` attribute.
+    key : str, optional
+        The argument is used to set `key` attribute.
+
+    Attributes
+    ----------
+    rate : float
+        The share of records that must be kept, from 0 to 1.
+    key : str or None
+        The name of the user defined form used as a sampling context.
+    sampled : int
+        The number of kept records.
+    dropped : int
+        The number of dropped records.
+    """
+
+    def __init__(self, rate, key=None):
+        self.rate = rate
+        self.key = key
+        self.sampled = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        pass
+
+    def _after_fork(self):
+        """Create new lock in the child process."""
+        self._lock = threading.Lock()
+        pass
+
+    def __str__(self):
+        return (f'Sampler(rate={self.rate}, key={self.key}, '
+                f'sampled={self.sampled}, dropped={self.dropped})')
+
+    __repr__ = __str__
+
+    @property
+    def rate(self):
+        """The share of records that must be kept."""
+        return self._rate
+
+    @rate.setter
+    def rate(self, value):
+        self._rate = value
+        self._limit = int(value * 0xFFFFFFFF)
+        pass
+
+    def check(self, kwargs):
+        """Check whether record must be kept.
+
+        Parameters
+        ----------
+        kwargs : dict
+            The user defined forms of record.
+
+        Returns
+        -------
+        result : bool
+            True if record must be kept and False if it must be dropped.
+        """
+        value = kwargs.get(self.key) if self.key is not None else None
+        if value is not None:
+            # Hash is mixed to spread close values like sequential ids.
+            value = zlib.crc32(str(value).encode()) * 2654435761
+            result = value & 0xFFFFFFFF <= self._limit
+        else:
+            result = random.random() < self._rate
+        with self._lock:
+            if result is True:
+                self.sampled += 1
+            else:
+                self.dropped += 1
+        return result
+
+    def reset(self):
+        """Reset the counters."""
+        self.sampled = 0
+        self.dropped = 0
+        pass
+
+class Grouper():
+    """This class represents grouper - object that groups exceptions by their
+    fingerprints.
+
+    Fingerprint is made of the exception type and the locations of the
+    traceback frames so the same error raised in the same place always has
+    the same fingerprint even in different runs. Grouper counts all the
+    exceptions. When window is defined only the first exception with the
+    fingerprint in the window is written in full while others are written
+    as one-line references.
+
+    Number of groups is limited. When new group does not fit then the group
+    that was not seen for the longest time is removed.
+
+    Parameters
+    ----------
+    window : int, float or bool, optional
+        The argument is used to set `window` attribute.
+    size : int, optional
+        The argument is used to set `size` attribute.
+
+    Attributes
+    ----------
+    window : int, float or bool
+        The length of the window in seconds. False means that all exceptions
+        are written in full. The default is False.
+    size : int
+        The maximum number of groups. The default is 1000.
+    groups : dict
+        The groups of exceptions ordered from the least to the most recently
+        seen. Keys are fingerprints and values are lists with the exception
+        name, the first value, the innermost location, number of exceptions,
+        dates of the first and the last exception and the time of window
+        end.
+    evicted : int
+        The number of groups removed because of the size limit.
+    """
+
+    def __init__(self, window=False, size=None):
+        self.window = window
+        self.size = size or 1000
+        self.groups = {}
+        self.evicted = 0
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+        pass
+
+    def _after_fork(self):
+        """Create new lock in the child process."""
+        self._lock = threading.Lock()
+        pass
+
+    def fingerprint(self, err_type, locations):
+        """Get the fingerprint of the exception.
+
+        Parameters
+        ----------
+        err_type : type
+            The type of exception.
+        locations : tuple
+            The pairs of code object and line number of traceback frames.
+
+        Returns
+        -------
+        fingerprint : str
+            The fingerprint as eight hexadecimal digits.
+        """
+        key = (err_type, locations)
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            text = f'{err_type.__module__}.{err_type.__qualname__}'
+            for f_code, lineno in locations:
+                text += f';{f_code.co_filename}:{f_code.co_name}:{lineno}'
+            fingerprint = f'{zlib.crc32(text.encode()):08x}'
+            if len(self._fingerprints) >= 256:
+                self._fingerprints.clear()
+            self._fingerprints[key] = fingerprint
+        return fingerprint
+
+    def check(self, err_type, err_value, locations):
+        """Count the exception and check whether it must be written in full.
+
+        Parameters
+        ----------
+        err_type : type
+            The type of exception.
+        err_value : Exception
+            The exception.
+        locations : tuple
+            The pairs of code object and line number of traceback frames.
+
+        Returns
+        -------
+        fingerprint : str
+            The fingerprint of the exception.
+        count : int
+            The number of exceptions with this fingerprint.
+        result : bool
+            True if exception must be written in full and False if only the
+            reference must be written.
+        """
+        fingerprint = self.fingerprint(err_type, locations)
+        now = time.monotonic()
+        date = dt.datetime.now()
+        with self._lock:
+            group = self.groups.pop(fingerprint, None)
+            if group is None:
+                if len(locations) > 0:
+                    f_code, lineno = locations[-1]
+                    location = f'{f_code.co_filename}:{lineno}'
+                else:
+                    location = None
+                group = [err_type.__name__, str(err_value), location, 0,
+                         date, date, 0]
+                while len(self.groups) >= self.size:
+                    self.groups.pop(next(iter(self.groups)))
+                    self.evicted += 1
+            # Group is moved to the end as the most recently seen.
+            self.groups[fingerprint] = group
+            group[3] += 1
+            group[5] = date
+            result = self.window is False or now >= group[6]
+            if result is True and self.window is not False:
+                group[6] = now + self.window
+            count = group[3]
+        return fingerprint, count, result
+
+    def summary(self):
+        """Get the groups of exceptions ordered by the number of exceptions.
+
+        Returns
+        -------
+        groups : list of dict
+            The groups with `fingerprint`, `name`, `value`, `location`,
+            `count`, `first` and `last` items.
+        """
+        with self._lock:
+            groups = [dict(fingerprint=fingerprint, name=name, value=value,
+                           location=location, count=count, first=first,
+                           last=last)
+                      for fingerprint, (name, value, location, count, first,
+                                        last, end) in self.groups.items()]
+        groups.sort(key=lambda group: group['count'], reverse=True)
+        return groups
+
+    def report(self, top=10):
+        """Get the text table with the most frequent groups of exceptions.
+
+        Parameters
+        ----------
+        top : int, optional
+            The number of groups that must be presented. The default is 10.
+
+        Returns
+        -------
+        text : str
+            The table of groups.
+        """
+        lines = [f'{"FINGERPRINT":<12} {"COUNT":>8} {"FIRST":<19} '
+                 f'{"LAST":<19} EXCEPTION']
+        for group in self.summary()[:top]:
+            first = group['first'].isoformat(sep=' ', timespec='seconds')
+            last = group['last'].isoformat(sep=' ', timespec='seconds')
+            lines.append(f'{group["fingerprint"]:<12} {group["count"]:>8} '
+                         f'{first:<19} {last:<19} {group["name"]}: '
+                         f'{group["value"]} at {group["location"]}')
+        if self.evicted > 0:
+            lines.append(f'{self.evicted} groups removed by size limit')
+        return '\n'.join(lines)
+
+    def reset(self):
+        """Remove all groups."""
+        with self._lock:
+            self.groups.clear()
+            self.evicted = 0
+        pass
@@ -1,5 +1,9 @@
 
 
+import re
+import string
+
+
 class Formatter():
     """This class represents formatter - object that defines the format of the
     output records.
@@ -14,19 +18,24 @@ class Formatter():
         Basic length of line in output.
     div : str, optional
         Text symbol used for borders and blocks.
+    depth : int, optional
+        Maximum number of traceback frames in error record.
     """
 
-    def __init__(self, record=None, error=None, length=80, div='*'):
+    def __init__(self, record=None, error=None, length=80, div='*',
+                 depth=100):
         def_record = '{isodate}\t{rectype}\t{message}\n'
         def_error = '{err_name}\t{err_value}\t{err_file}\t{err_line}\t{err_obj}'
 
         record = record or def_record
         error = def_error if error is None else error
 
-        self.configure(record=record, error=error, length=length, div=div)
+        self.configure(record=record, error=error, length=length, div=div,
+                       depth=depth)
         pass
 
-    def configure(self, record=None, error=None, length=None, div=None):
+    def configure(self, record=None, error=None, length=None, div=None,
+                  depth=None):
         """Configure Formatter instance parameters.
 
         Parameters
@@ -39,9 +48,66 @@ class Formatter():
             Basic length of line in output.
         div : str, optional
             Text symbol used for borders and blocks.
+        depth : int, optional
+            Maximum number of traceback frames in error record.
         """
-        if record is not None: self.record = record
+        if record is not None:
+            self.record = record
+            self._pattern = None
         if error is not None: self.error = error
         if length is not None: self.length = length
         if div is not None: self.div = div
+        if depth is not None: self.depth = depth
         pass
+
+    def parse(self, line):
+        """Parse formatted record back to the forms according to the record
+        template.
+
+        Parameters
+        ----------
+        line : str
+            The string that was created with the record template.
+
+        Returns
+        -------
+        forms : dict or None
+            The dictionary with forms found in string or None if string does
+            not match the record template.
+        """
+        if self._pattern is None:
+            self._pattern = self._compile(self.record)
+        match = self._pattern.match(line.rstrip('\n'))
+        if match is not None:
+            return match.groupdict()
+
+    def _compile(self, template):
+        """Compile record template to the regular expression where each form
+        becomes a named group.
+
+        Parameters
+        ----------
+        template : str
+            The record template.
+
+        Returns
+        -------
+        pattern : re.Pattern
+            The compiled regular expression.
+        """
+        names = []
+        parts = []
+        for text, name, spec, conv in string.Formatter().parse(template):
+            parts.append(re.escape(text.rstrip('\n')))
+            if name is not None:
+                name = re.split(r'[.\[]', name)[0]
+                if name in names:
+                    parts.append(f'(?P={name})')
+                else:
+                    names.append(name)
+                    parts.append(f'(?P<{name}>.*?)')
+        pattern = ''.join(parts)
+        # Last form in template can take the rest of the line.
+        if pattern.endswith('.*?)'):
+            pattern = pattern[:-4] + '.*)'
+        return re.compile(f'{pattern}$')
@@ -11,6 +11,11 @@ class Header():
     can be presented both as functions returning some sting and as a regular
     string.
 
+    Rendered lines are cached. Only the items listed in `dynamic` attribute
+    are computed again on each call. Cache is reset on `include()`,
+    `exclude()` and when `length` or `div` is changed. Call `reset()` after
+    editing `items` directly.
+
     Parameters
     ----------
     logger : Logger
@@ -33,6 +38,10 @@ class Header():
         Symbolic block used for borders.
     items : dict
         Dictionary with header variables.
+    dynamic : set
+        Names of variables that are computed on each call. By default these
+        are application, description, version, pid and locdate, so the header
+        written in the forked process shows its own PID.
     """
 
     def __init__(self, logger, *args, **kwargs):
@@ -55,6 +64,10 @@ class Header():
                       'script': lambda: self.logger.sysinfo.desc.script,
                       'pip': lambda: self.logger.sysinfo.desc.pip,
                       'locdate': lambda: self.logger.sysinfo.desc.locdate}
+        self.dynamic = {'application', 'description', 'version', 'pid',
+                        'locdate'}
+        self.__lines = None
+        self.__key = None
         if args or kwargs:
             self.include(**kwargs)
             self.exclude(*args)
@@ -76,37 +89,25 @@ class Header():
         """
         # Change flag to determine that header is already used in logger.
         self._used = True
-        # Calculate all necessary lengths.
-        ln_out, ln_in, ln_name, ln_value = self._calculate_lengths()
-        lines = []
-
-        # Format of the one line of header.
-        frame_format = '{div}{content:{filler}<{ln_in}}{div}\n'
-        all = dict(div=self.div, ln_in=ln_in)
-
-        # Get basic top two lines of the header.
-        top = frame_format.format(content='', filler=self.div, **all)
-        top += frame_format.format(content='', filler='', **all)
-        lines.append(top)
-
-        # Get all lines with the variables.
-        content_format = '{name:>{ln_name}}: {value}'
-        for d_name, d_value in self.items.items():
-            name = d_name.upper()
-            value = d_value() if callable(d_value) is True else d_value
-            content = content_format.format(name=name, ln_name=ln_name,
-                                            value=value)
-            frame = frame_format.format(content=content, filler='', **all)
-            lines.append(frame)
-
-        # Get buttom two lines of the header.
-        bottom = frame_format.format(content='', filler='', **all)
-        bottom += frame_format.format(content='', filler=self.div, **all)
-        lines.append(bottom)
+        # Render static lines only when they are not cached yet.
+        key = (self.length, self.div)
+        if self.__lines is None or self.__key != key:
+            self.__lines = self.__render()
+            self.__key = key
 
+        lines = []
+        for line in self.__lines:
+            if isinstance(line, tuple) is True:
+                line = self.__frame(*line)
+            lines.append(line)
         header = ''.join(lines)
         return header
 
+    def reset(self):
+        """Reset the cache of rendered lines."""
+        self.__lines = None
+        pass
+
     def include(self, pos='start', **kwargs):
         """Add variables to the header.
 
@@ -122,6 +123,7 @@ class Header():
             self.items = {**kwargs, **self.items}
         elif pos == 'end':
             self.items = {**self.items, **kwargs}
+        self.reset()
         pass
 
     def exclude(self, *args):
@@ -135,8 +137,51 @@ class Header():
         """
         for arg in args:
             del self.items[arg]
+        self.reset()
         pass
 
+    def __render(self):
+        """Render all lines of the header. Lines of dynamic variables are
+        presented as tuples with parameters of `__frame()`.
+
+        Returns
+        -------
+        lines : list
+            The list of strings and tuples.
+        """
+        # Calculate all necessary lengths.
+        ln_out, ln_in, ln_name, ln_value = self._calculate_lengths()
+        lines = []
+
+        # Format of the one line of header.
+        frame_format = '{div}{content:{filler}<{ln_in}}{div}\n'
+        all = dict(div=self.div, ln_in=ln_in)
+
+        # Get basic top two lines of the header.
+        top = frame_format.format(content='', filler=self.div, **all)
+        top += frame_format.format(content='', filler='', **all)
+        lines.append(top)
+
+        # Get all lines with the variables.
+        for d_name, d_value in self.items.items():
+            line = (d_name, d_value, ln_name, ln_in)
+            if d_name not in self.dynamic:
+                line = self.__frame(*line)
+            lines.append(line)
+
+        # Get buttom two lines of the header.
+        bottom = frame_format.format(content='', filler='', **all)
+        bottom += frame_format.format(content='', filler=self.div, **all)
+        lines.append(bottom)
+        return lines
+
+    def __frame(self, d_name, d_value, ln_name, ln_in):
+        """Format the line of the header with one variable."""
+        name = d_name.upper()
+        value = d_value() if callable(d_value) is True else d_value
+        content = f'{name:>{ln_name}}: {value}'
+        return f'{self.div}{content:<{ln_in}}{self.div}\n'
+
     def _calculate_lengths(self):
         """Calculate all lengths used in header formatting.
 
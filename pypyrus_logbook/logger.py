@@ -1,18 +1,29 @@
+import asyncio
 import atexit
 import datetime as dt
 import os
 import platform
 import pypyrus_logbook as logbook
 import sys
+import threading
 import time
 import traceback
 
 from .conf import all_loggers
+from .filters import Filters
+from .filters import Grouper
+from .filters import Sampler
+from .filters import Suppressor
+from .filters import Throttle
 from .formatter import Formatter
 from .header import Header
+from .metrics import Metrics
+from .output import Handle
 from .output import Root
 from .record import Record
+from .record import catch_frame
 from .sysinfo import Sysinfo
+from .writer import Writer
 
 
 class Logger():
@@ -50,12 +61,20 @@ class Logger():
         The argument is used to open or close output `html`.
     table : bool, optional
         The argument is used to open or close output `table`.
+    recorder : int or bool, optional
+        The argument is used to open or close output `recorder`. Integer
+        value defines the number of records kept by the recorder.
     directory : str, optional
         The argument is used to set logging file folder.
     filename : str, optional
         The argument is used to set logging file name.
     extension : str, optional
         The argument is used to set logging file extension.
+    json : bool, optional
+        The argument is used to write logging file in JSON Lines format.
+    index : int or bool, optional
+        The argument is used to maintain time index of logging file. Must be
+        presented as width of time bucket in seconds.
     smtp : dict, optional
         The argument is used to configure SMTP connection.
     db : dict, optional
@@ -64,14 +83,26 @@ class Logger():
         The argument is used to set record template.
     info : bool, optional
         The argument is used to filter info records. The default is True.
-    debug : bool, optional
+    debug : bool, float or Sampler, optional
         The argument is used to filter debug records. The default is False.
+        Float value or `Sampler` object means that only a part of records
+        will be written. Same works for all the record types.
     warning : bool, optional
         The argument is used to filter warning records. The default is True.
     error : bool, optional
         The argument is used to filter error records. The default is True.
     critical : bool, optional
         The argument is used to filter critical records. The default is True.
+    suppress : int, float or bool, optional
+        The argument is used to enable suppression of repeated records. Must
+        be presented as length of suppression window in seconds. The default
+        is False which means it is disabled.
+    group : int, float or bool, optional
+        The argument is used to group repeated exceptions. Must be presented
+        as length of grouping window in seconds. Only the first exception
+        with the same fingerprint in the window is written in full. The
+        default is False which means that all exceptions are written in
+        full.
     alarming : bool, optional
         The argument is used to enable or disable alarming mechanism. The
         default is True.
@@ -92,6 +123,16 @@ class Logger():
     maxerrors : int or bool, optional
         The argument is used to define maximun number of errors. The default
         is False which means it is disabled.
+    profile : bool, optional
+        The argument is used to collect statistics of records for each call
+        site. The default is False.
+    deferred : bool, optional
+        The argument is used to defer the rendering of records to the
+        background writer. Caller only captures the raw fields of record
+        while all formatting is done by the writer thread. Note that user
+        defined forms are passed by reference so mutable values that are
+        changed after the call may be written with their new state. Pass
+        the copy or the string of such values. The default is False.
 
     Attributes
     ----------
@@ -138,9 +179,21 @@ class Logger():
     count_errors : int
         Number of errors that logger catched in the application during its
         execution.
-    filters : dict
+    filters : Filters
         Record types filters. To filter record type just set corresponding
-        item value to False.
+        item value to False. To write only a part of records set the value to
+        `Sampler` object. Its counters show the number of sampled and
+        dropped records. Changes are passed to the children at once.
+    suppressor : pypyrus_logbook.filters.Suppressor or None
+        The object that counts repeated records instead of writing them.
+        It is None when suppression is disabled.
+    grouper : pypyrus_logbook.filters.Grouper
+        The object that counts exceptions by their fingerprints. Its
+        summary is included to the alarm message.
+    throttle : pypyrus_logbook.filters.Throttle
+        The object that limits the rate of records from the same call site.
+        It is used when one of `every`, `every_seconds` or `once` arguments
+        is passed to the write methods.
     root : pypyrus_logbook.output.Root
         The output `Root` object.
     console : pypyrus_logbook.output.Console
@@ -153,6 +206,8 @@ class Logger():
         The output HTML document. Shortcut for `Logger.output.html`.
     table: pypyrus_logbook.output.Table
         The output table. Shortcut for `Logger.output.table`.
+    recorder: pypyrus_logbook.output.Recorder
+        The flight recorder. Shortcut for `Logger.output.recorder`.
     formatter : pypyrus_logbook.formatter.Formatter
         Logger formatter which sets all formatting configuration like
         record template, error message template, line length etc.
@@ -162,18 +217,26 @@ class Logger():
         and environment variables and transforms all of that to `Dataset`
         object. Through the `Dataset` object data can be easily accessed by
         get item operation or by point like `sysinfo.desc['hostname']` or
-        `sysinfo.desc.hostname`.
+        `sysinfo.desc.hostname`. Each logger has its own flag arguments while
+        all the datasets are shared by all loggers of the process.
     header : pypyrus_logbook.header.Header
         The header that can be printed to the writable output.
+    metrics : pypyrus_logbook.metrics.Metrics
+        Counters and latency histograms of the logger. Values can be taken
+        as a dictionary with `metrics.snapshot()`, in Prometheus text format
+        with `metrics.prometheus()`, dumped to the file with
+        `metrics.dump()` or served by HTTP with `metrics.serve()`.
     """
 
     def __init__(self, name=None, app=None, desc=None, version=None,
                  status=True, console=True, file=True, email=False, html=False,
-                 table=False, directory=None, filename=None, extension=None,
-                 smtp=None, db=None, format=None, info=True, debug=False,
-                 warning=True, error=True, critical=True, alarming=True,
-                 control=True, maxsize=(1024*1024*10), maxdays=1, maxlevel=2,
-                 maxerrors=False):
+                 table=False, recorder=False, directory=None, filename=None,
+                 extension=None, json=False, index=False, smtp=None, db=None,
+                 format=None, info=True, debug=False, warning=True,
+                 error=True, critical=True, suppress=False, group=False,
+                 alarming=True, control=True, maxsize=(1024*1024*10),
+                 maxdays=1, maxlevel=2, maxerrors=False, profile=False,
+                 deferred=False):
         # Unique name of the logger.
         self._name = name
 
@@ -190,16 +253,27 @@ class Logger():
         self.messages = {'ok': 'OK', 'success': 'SUCCESS', 'fail': 'FAIL'}
         self._with_error = False
         self._count_errors = 0
+        self._lock = threading.RLock()
+        self._closed = False
+        self._writer = None
+        self._tracebacks = {}
+        self.grouper = Grouper()
+        self.throttle = Throttle()
+        self.children = []
+        self.metrics = Metrics(self)
 
         # Complete the initial configuration.
         self.configure(app=app, desc=desc, version=version, status=status,
                        console=console, file=file, email=email, html=html,
-                       table=table, directory=directory, filename=filename,
-                       extension=extension, smtp=smtp, db=db, format=format,
-                       info=info, debug=debug, warning=warning, error=error,
-                       critical=critical, alarming=alarming, control=control,
+                       table=table, recorder=recorder, directory=directory,
+                       filename=filename, extension=extension, json=json,
+                       index=index, smtp=smtp, db=db, format=format, info=info,
+                       debug=debug, warning=warning, error=error,
+                       critical=critical, suppress=suppress, group=group,
+                       alarming=alarming, control=control,
                        maxsize=maxsize, maxdays=maxdays, maxlevel=maxlevel,
-                       maxerrors=maxerrors)
+                       maxerrors=maxerrors, profile=profile,
+                       deferred=deferred)
 
         # Output shortcuts.
         self.console = self.root.console
@@ -207,9 +281,10 @@ class Logger():
         self.email = self.root.email
         self.html = self.root.html
         self.table = self.root.table
+        self.recorder = self.root.recorder
 
-        # Set exit function.
-        atexit.register(self._exit)
+        # Logger is finished by the exit function shared by all loggers.
+        all_loggers.live.add(self)
 
         # Add creating logger to special all_loggers dictinary.
         all_loggers[self._name] = self
@@ -225,6 +300,11 @@ class Logger():
         """Unique logger name."""
         return self._name
 
+    @property
+    def closed(self):
+        """Is logger closed."""
+        return self._closed
+
     @property
     def start_date(self):
         """Logging start date."""
@@ -242,10 +322,13 @@ class Logger():
 
     def configure(self, app=None, desc=None, version=None, status=None,
                   console=None, file=None, email=None, html=None, table=None,
-                  directory=None, filename=None, extension=None, smtp=None,
-                  db=None, format=None, info=None, debug=None, warning=None,
-                  error=None, critical=None, alarming=None, control=None,
-                  maxsize=None, maxdays=None, maxlevel=None, maxerrors=None):
+                  recorder=None, directory=None, filename=None,
+                  extension=None, json=None, index=None, smtp=None, db=None,
+                  format=None, info=None, debug=None, warning=None,
+                  error=None, critical=None, suppress=None, group=None,
+                  alarming=None, control=None, maxsize=None, maxdays=None,
+                  maxlevel=None, maxerrors=None, profile=None,
+                  deferred=None):
         """Main method to configure the logger and all its attributes.
         This is an only one right way to customize logger. Parameters are the
         same as for creatrion.
@@ -270,12 +353,18 @@ class Logger():
             The argument is used to open or close output `html`.
         table : bool, optional
             The argument is used to open or close output `table`.
+        recorder : int or bool, optional
+            The argument is used to open or close output `recorder`.
         directory : str, optional
             The argument is used to set logging file folder.
         filename : str, optional
             The argument is used to set logging file name.
         extension : str, optional
             The argument is used to set logging file extension.
+        json : bool, optional
+            The argument is used to write logging file in JSON Lines format.
+        index : int or bool, optional
+            The argument is used to maintain time index of logging file.
         smtp : dict, optional
             The argument is used to configure SMTP connection.
         db : dict, optional
@@ -284,7 +373,7 @@ class Logger():
             The argument is used to set record template.
         info : bool, optional
             The argument is used to filter info records.
-        debug : bool, optional
+        debug : bool, float or Sampler, optional
             The argument is used to filter debug records.
         warning : bool, optional
             The argument is used to filter warning records.
@@ -292,6 +381,10 @@ class Logger():
             The argument is used to filter error records.
         critical : bool, optional
             The argument is used to filter critical records.
+        suppress : int, float or bool, optional
+            The argument is used to enable suppression of repeated records.
+        group : int, float or bool, optional
+            The argument is used to group repeated exceptions.
         alarming : bool, optional
             The argument is used to enable or disable alarming mechanism.
         control : bool, optional
@@ -306,6 +399,12 @@ class Logger():
             The argument is used to define the break error level.
         maxerrors : int or bool, optional
             The argument is used to define maximun number of errors.
+        profile : bool, optional
+            The argument is used to collect statistics of records for each
+            call site.
+        deferred : bool, optional
+            The argument is used to defer the rendering of records to the
+            background writer.
         """
         if isinstance(app, str) is True: self.app = app
         if isinstance(desc, str) is True: self.desc = desc
@@ -316,25 +415,38 @@ class Logger():
         # existing output if it is requested.
         if hasattr(self, 'root') is False:
             self.root = Root(self, console=console, file=file, email=email,
-                             html=html, table=table, status=status,
+                             html=html, table=table, recorder=recorder,
+                             status=status,
                              directory=directory, filename=filename,
-                             extension=extension, smtp=smtp, db=db)
+                             extension=extension, json=json, index=index,
+                             smtp=smtp, db=db)
         else:
             for key, value in {'console': console, 'file': file,
                                'email': email, 'html': html,
                                'table': table}.items():
                 if value is True:
                     getattr(self.root, key).open()
-                    if key == 'file':
+                    if key in ('file', 'html'):
                         getattr(self.root, key).new()
                 elif value is False:
                     getattr(self.root, key).close()
 
+            # Customize flight recorder.
+            if recorder is True:
+                self.root.recorder.open()
+            elif recorder is False:
+                self.root.recorder.close()
+            elif isinstance(recorder, int) is True:
+                self.root.recorder.configure(size=recorder)
+                self.root.recorder.open()
+
             # Customize output file path.
             path = {}
             if directory is not None: path['dir'] = directory
             if filename is not None: path['name'] = filename
             if extension is not None: path['ext'] = extension
+            if json is not None: path['json'] = json
+            if index is not None: path['index'] = index
             if len(path) > 0:
                 self.root.file.configure(**path)
 
@@ -360,13 +472,36 @@ class Logger():
             self.formatter.configure(**format)
 
         # Create or customize record type filters.
+        # Float value is a rate of records that must be sampled.
         if hasattr(self, 'filters') is False:
-            self.filters = {}
+            self.filters = Filters(self)
         for key, value in {'info': info, 'debug': debug, 'error': error,
                            'warning': warning, 'critical': critical}.items():
-            if isinstance(value, bool) is True:
+            if isinstance(value, float) is True:
+                value = Sampler(value)
+            if isinstance(value, (bool, Sampler)) is True:
                 self.filters[key] = value
 
+        # Create or remove suppressor of repeated records.
+        if hasattr(self, 'suppressor') is False:
+            self.suppressor = None
+        if suppress is False:
+            if self.suppressor is not None:
+                self.suppressor.flush()
+            self.suppressor = None
+        elif isinstance(suppress, (int, float)) is True:
+            window = suppress if suppress is not True else None
+            if self.suppressor is None:
+                self.suppressor = Suppressor(self, window=window)
+            elif window is not None:
+                self.suppressor.window = window
+
+        # Set the window of exception grouping.
+        if group is True:
+            self.grouper.window = 60
+        elif isinstance(group, (int, float)) is True or group is False:
+            self.grouper.window = group
+
         # Customize limits and parameters of execution behaviour.
         if isinstance(maxsize, (int, float, bool)) is True:
             self._maxsize = maxsize
@@ -381,10 +516,16 @@ class Logger():
             self._alarming = alarming
         if isinstance(control, bool) is True:
             self._control = control
-
-        # Initialize sysinfo instance when not exists.
+        if isinstance(profile, bool) is True:
+            self._profile = profile
+        if isinstance(deferred, bool) is True:
+            self._deferred = deferred
+            if deferred is True:
+                self.__start_writer()
+
+        # Put own sysinfo instance on top of one shared by all loggers.
         if hasattr(self, 'sysinfo') is False:
-            self.sysinfo = Sysinfo(self)
+            self.sysinfo = Sysinfo(self, base=Sysinfo.shared())
 
         # Initialize header instance when not exists.
         if hasattr(self, 'header') is False:
@@ -399,11 +540,31 @@ class Logger():
         record : Record
             The argument is used to send it to the output `root`.
         """
+        writer = self._writer
+        if writer is not None:
+            writer.write(record)
+        else:
+            self._write(record)
+        pass
+
+    def _write(self, record):
+        """Write the record to the output `root` in the current thread.
+        When profiling is enabled the bytes written to the outputs are added
+        to the call site of the record.
+        """
         self.__check_file_stats()
-        self.root.write(record)
+        if self._profile is True and isinstance(record, Record) is True:
+            written = self.metrics.written()
+            self.root.write(record)
+            size = self.metrics.written() - written
+            site = (record.flname, record.objname, record.lineno)
+            self.metrics.profile(site, size, 0, count=0)
+        else:
+            self.root.write(record)
         pass
 
-    def record(self, rectype, message, error=False, **kwargs):
+    def record(self, rectype, message, error=False, every=None,
+               every_seconds=None, once=False, **kwargs):
         """Basic method to write records.
 
         Parameters
@@ -418,13 +579,55 @@ class Logger():
             The message that must be written.
         error : bool, optional
             If record is error then set that parameter to `True`.
+        every : int, optional
+            If set then only each N-th record from the same call site is
+            written.
+        every_seconds : int or float, optional
+            If set then not more than one record from the same call site is
+            written in given number of seconds.
+        once : bool, optional
+            If `True` then only the first record from the same call site is
+            written.
         **kwargs
             The keyword arguments used for additional forms (variables) for
             record and message formatting.
         """
-        if self.filters.get(rectype, True) is True:
+        if every is not None or every_seconds is not None or once is True:
+            if self.throttle.check(every, every_seconds, once) is False:
+                self.metrics.count('filtered', rectype)
+                return
+        passed = self.filters.get(rectype, True)
+        if isinstance(passed, Sampler) is True:
+            passed = passed.check(kwargs)
+        if passed is True:
+            if self.suppressor is not None and error is False:
+                if self.suppressor.check(rectype, message, kwargs) is False:
+                    self.metrics.count('filtered', rectype)
+                    return
+            # Only raw fields are captured, writer will render them.
+            if self._deferred is True and self._profile is False:
+                writer = self._writer
+                if writer is not None:
+                    frame = catch_frame()
+                    if error is True and message is None:
+                        message = self.formatter.error
+                    writer.write((self, time.time_ns(), rectype, message,
+                                  kwargs, frame.f_code, frame.f_lineno,
+                                  threading.current_thread().name))
+                    return
+            if self._profile is True:
+                start = time.perf_counter_ns()
             record = Record(self, rectype, message, error=error, **kwargs)
             self.write(record)
+            self.metrics.count('records', rectype)
+            if self._profile is True:
+                value = time.perf_counter_ns() - start
+                site = (record.flname, record.objname, record.lineno)
+                self.metrics.profile(site, 0, value)
+        else:
+            self.metrics.count('filtered', rectype)
+            if self.root.recorder.status is True:
+                self.root.recorder.capture(rectype, message, kwargs)
         pass
 
     def info(self, message, **kwargs):
@@ -440,7 +643,7 @@ class Logger():
         pass
 
     def error(self, message=None, rectype='error', format=None, alarming=False,
-              level=1, **kwargs):
+              level=1, every=None, every_seconds=None, once=False, **kwargs):
         """Send ERROR record to the output.
         If exception in current traceback exists then method will format the
         exception according to `formatter.error` string presentation. If
@@ -463,42 +666,62 @@ class Logger():
             for this certain call.
         level : int
             The argument is used to describe the error level.
+        every : int, optional
+            If set then only each N-th error from the same call site is
+            processed.
+        every_seconds : int or float, optional
+            If set then not more than one error from the same call site is
+            processed in given number of seconds.
+        once : bool, optional
+            If `True` then only the first error from the same call site is
+            processed.
         **kwargs
             The keyword arguments used for additional forms (variables) for
             record and message formatting.
         """
-        self._with_error = True
-        self._count_errors += 1
+        # Throttled error is ignored completely.
+        if every is not None or every_seconds is not None or once is True:
+            if self.throttle.check(every, every_seconds, once) is False:
+                return
+        with self._lock:
+            self._with_error = True
+            self._count_errors += 1
 
         format = self.formatter.error if format is None else format
         # Parse the error.
         err_type, err_value, err_tb = sys.exc_info()
         if message is None and err_type is not None:
-            if isinstance(format, str) is True:
-                err_name = err_type.__name__
-                err_value = err_value
-
-                for tb in traceback.walk_tb(err_tb):
-                    f_code = tb[0].f_code
-
-                    err_file = os.path.abspath(f_code.co_filename)
-                    err_line = tb[1]
-                    err_obj = f_code.co_name
-
-                    self.record(rectype, message, error=True,
-                                err_name=err_name, err_value=err_value,
-                                err_file=err_file, err_line=err_line,
-                                err_obj=err_obj, **kwargs)
-            elif format is False:
-                exception = traceback.format_exception(err_type, err_value,
-                                                       err_tb)
-                message = '\n'
-                message += ''.join(exception)
-                self.record(rectype, message, **kwargs)
+            if isinstance(format, str) is True or format is False:
+                locations = []
+                tb = err_tb
+                while tb is not None:
+                    locations.append((tb.tb_frame.f_code, tb.tb_lineno))
+                    tb = tb.tb_next
+                locations = tuple(locations)
+                fingerprint, count, full = self.grouper.check(err_type,
+                                                              err_value,
+                                                              locations)
+                if full is True:
+                    message = self.__format_error(format, err_type,
+                                                  err_value, locations,
+                                                  kwargs)
+                else:
+                    message = (f'{err_type.__name__}: {err_value} '
+                               f'[{fingerprint} #{count}]')
+                if self.grouper.window is not False and full is True:
+                    sep = ' ' if format is not False else ''
+                    message = f'[{fingerprint}]{sep}{message}'
+                # Message is already formatted so braces must be kept.
+                message = message.replace('{', '{{').replace('}', '}}')
+                self.record(rectype, message, error=True, **kwargs)
         else:
             message = message or ''
             self.record(rectype, message, **kwargs)
 
+        # Dump the context of the error from flight recorder.
+        if level >= 1 and self.root.recorder.status is True:
+            self._submit(self.root.recorder.dump)
+
         # Break execution in case of critical error if permitted.
         # The alarm will be generated at exit if it is configured.
         if self._control is True:
@@ -510,7 +733,7 @@ class Logger():
 
         # Send alarm if execution was not aborted but alarm is needed.
         if alarming is True:
-            self.root.email.alarm()
+            self._submit(self.root.email.alarm)
         pass
 
     def warning(self, message=None, **kwargs):
@@ -602,12 +825,104 @@ class Logger():
         self.record(rectype, message, **kwargs)
         pass
 
+    def report_call_sites(self, top=10, sort='bytes'):
+        """Print the call sites that produce the most of records. Works only
+        when profiling is enabled.
+
+        Parameters
+        ----------
+        top : int, optional
+            The number of call sites that must be printed. The default is 10.
+        sort : str, optional
+            The statistic used for ordering: count, bytes or seconds. The
+            default is bytes.
+
+        Returns
+        -------
+        sites : list of tuple
+            The pairs of call site and its statistics.
+        """
+        sites = self.metrics.call_sites()
+        sites = sorted(sites.items(), key=lambda item: item[1][sort],
+                       reverse=True)[:top]
+        lines = [f'{"FILE":<20} {"OBJECT":<20} {"LINE":>6} '
+                 f'{"COUNT":>10} {"BYTES":>12} {"SECONDS":>10}']
+        for (flname, objname, lineno), stats in sites:
+            lines.append(f'{flname:<20} {objname:<20} {lineno:>6} '
+                         f'{stats["count"]:>10} {stats["bytes"]:>12} '
+                         f'{stats["seconds"]:>10.6f}')
+        print('\n'.join(lines))
+        return sites
+
+    def report_errors(self, top=10):
+        """Print the groups of exceptions that occurred the most.
+
+        Parameters
+        ----------
+        top : int, optional
+            The number of groups that must be printed. The default is 10.
+
+        Returns
+        -------
+        groups : list of dict
+            The groups with `fingerprint`, `name`, `value`, `location`,
+            `count`, `first` and `last` items.
+        """
+        print(self.grouper.report(top))
+        return self.grouper.summary()[:top]
+
+    def child(self, name):
+        """Get the child logger or create it if it does not exist yet.
+
+        Parameters
+        ----------
+        name : str
+            The name of the child without the name of this logger.
+
+        Returns
+        -------
+        child : Child
+            The `Child` object with the name `{logger}.{name}`.
+        """
+        name = f'{self.name}.{name}'
+        with self._lock:
+            child = all_loggers.get(name)
+            if child is None:
+                child = Child(self, name)
+                self.children.append(child)
+                all_loggers[name] = child
+        return child
+
+    def close(self):
+        """Close the logger.
+        Pending records are written, summaries of suppressed records are
+        flushed and alarm is sent if it is needed. After that files are
+        closed, connections to SMTP server and database are released and
+        logger with its children is removed from the registry. Closed logger
+        does not write records anymore.
+        """
+        with self._lock:
+            if self._closed is True:
+                return
+            self._closed = True
+        all_loggers.live.discard(self)
+        self._exit()
+        for child in list(self.children):
+            child.close()
+        self.root.close()
+        self.root.release()
+        self.metrics.shutdown()
+        if all_loggers.get(self._name) is self:
+            all_loggers.pop(self._name, None)
+        pass
+
     def restart(self):
         """Restart logging. Will open new file."""
         self._start_date = dt.datetime.now()
         self.__calculate_restart_date()
         if self.root.file.status is True:
-            self.root.file.new()
+            self.root.file.new(unique=True)
+            self.metrics.count('rotations')
         if self.header.used is True:
             self.head()
         pass
@@ -626,12 +941,210 @@ class Logger():
         self.root.table.write(**kwargs)
         pass
 
+    async def arecord(self, rectype, message, **kwargs):
+        """Send record to the output without blocking the event loop.
+        Record is created in the current task and written by the background
+        writer thread. Writer is started with the first asynchronous call and
+        after that all records of the logger are written by it so the order
+        is kept.
+        Parameters are the same as in `record()`.
+        """
+        self.__start_writer()
+        self.record(rectype, message, **kwargs)
+        pass
+
+    async def ainfo(self, message, **kwargs):
+        """Send INFO record to output without blocking the event loop."""
+        self.__start_writer()
+        self.record('info', message, **kwargs)
+        pass
+
+    async def adebug(self, message, **kwargs):
+        """Send DEBUG record to output without blocking the event loop."""
+        self.__start_writer()
+        self.record('debug', message, **kwargs)
+        pass
+
+    async def aerror(self, message=None, **kwargs):
+        """Send ERROR record to output without blocking the event loop.
+        Exception is parsed in the current task while the output, recorder
+        dump and alarm are done by the background writer thread.
+        Parameters are the same as in `error()`.
+        """
+        self.__start_writer()
+        self.error(message, **kwargs)
+        pass
+
+    async def awarning(self, message=None, **kwargs):
+        """Send WARNING record to output without blocking the event loop."""
+        self.__start_writer()
+        self.error(message, rectype='warning', level=0, **kwargs)
+        pass
+
+    async def acritical(self, message=None, **kwargs):
+        """Send CRITICAL record to output without blocking the event
+        loop.
+        """
+        self.__start_writer()
+        self.error(message, rectype='critical', level=2, **kwargs)
+        pass
+
+    async def asend(self, *args, **kwargs):
+        """Send email message without blocking the event loop. Note that
+        SMTP server connection must be configured.
+        """
+        self.__start_writer()
+        future = self._writer.call(self.root.email.send, *args, **kwargs)
+        await asyncio.wrap_future(future)
+        pass
+
+    async def aset(self, **kwargs):
+        """Update values in table without blocking the event loop. Note that
+        DB connection must be configured.
+        """
+        self.__start_writer()
+        future = self._writer.call(self.root.table.write, **kwargs)
+        await asyncio.wrap_future(future)
+        pass
+
+    async def aclose(self):
+        """Wait until all pending records are written and stop the
+        background writer. After that records are written directly again.
+        """
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            await asyncio.wrap_future(writer.stop())
+        pass
+
+    def _submit(self, func):
+        """Execute the function by the background writer if it is running
+        or in the current thread if it is not.
+        """
+        writer = self._writer
+        if writer is not None:
+            writer.call(func)
+        else:
+            func()
+        pass
+
     def _exit(self):
+        # Write pending records.
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.stop().result()
+        # Write summaries of suppressed records.
+        if self.suppressor is not None:
+            self.suppressor.flush()
         # Inform about the error.
         if self._alarming is True and self._with_error is True:
             self.root.email.alarm()
         pass
 
+    def _refilter(self, key, value):
+        """Resolve filters of the children after the filter is changed."""
+        for child in self.children:
+            child._resolve()
+        pass
+
+    def _after_fork(self):
+        """Make the logger work in the child process.
+        Locks are created again because they can be held by the threads of
+        the parent process which do not exist in the child. Records pending
+        in the queue of the parent writer are left to the parent and the new
+        writer thread is started if records are deferred. Errors of the
+        parent are not reported by the child.
+        """
+        self._lock = threading.RLock()
+        self._writer = None
+        self._with_error = False
+        self._count_errors = 0
+        self.root._after_fork()
+        self.metrics._after_fork()
+        self.throttle._after_fork()
+        self.grouper._after_fork()
+        if self.suppressor is not None:
+            self.suppressor._after_fork()
+        for value in self.filters.values():
+            if isinstance(value, Sampler) is True:
+                value._after_fork()
+        for child in self.children:
+            child._after_fork()
+        if self._deferred is True:
+            self.__start_writer()
+        pass
+
+    def __format_error(self, format, err_type, err_value, locations,
+                       kwargs):
+        """Render the exception into one multi-line message.
+        File names and lines of the same exception raised in the same place
+        are taken from the cache so only the value of exception is formatted
+        again. Only the last frames are kept according to `Formatter.depth`.
+        Lines after the first one are indented so they are never read back
+        as separate records.
+        """
+        depth = self.formatter.depth
+        skipped = max(len(locations)-depth, 0)
+        locations = locations[skipped:]
+
+        # Chained exceptions are formatted by the standard way.
+        chained = (err_value.__cause__ is not None
+                   or (err_value.__context__ is not None
+                       and err_value.__suppress_context__ is False))
+        key = (err_type, format is False, locations)
+        cached = self._tracebacks.get(key) if chained is False else None
+
+        if format is False:
+            if cached is None:
+                limit = -depth if depth > 0 else None
+                exception = traceback.format_exception(
+                    err_type, err_value, err_value.__traceback__, limit=limit)
+                if chained is False:
+                    # Only the stack is cached, value is formatted each time.
+                    only = traceback.format_exception_only(err_type,
+                                                           err_value)
+                    stack = exception[:len(exception)-len(only)]
+                    self.__cache_traceback(key, ''.join(stack))
+            else:
+                exception = [cached]
+                exception += traceback.format_exception_only(err_type,
+                                                             err_value)
+            return '\n' + ''.join(exception)
+
+        if cached is None:
+            cached = [(os.path.abspath(f_code.co_filename), lineno,
+                       f_code.co_name) for f_code, lineno in locations]
+            self.__cache_traceback(key, cached)
+        err_name = err_type.__name__
+        lines = []
+        if skipped > 0:
+            lines.append(f'... {skipped} frames skipped')
+        for err_file, err_line, err_obj in cached:
+            try:
+                line = format.format(err_name=err_name, err_value=err_value,
+                                     err_file=err_file, err_line=err_line,
+                                     err_obj=err_obj, **kwargs)
+            except KeyError:
+                line = format
+            lines.append(line)
+        return '\n  '.join(lines)
+
+    def __cache_traceback(self, key, value):
+        """Put the rendered traceback to the limited cache."""
+        if len(self._tracebacks) >= 256:
+            self._tracebacks.clear()
+        self._tracebacks[key] = value
+        pass
+
+    def __start_writer(self):
+        """Start the background writer if it is not running yet."""
+        if self._writer is None and self._closed is False:
+            with self._lock:
+                if self._writer is None and self._closed is False:
+                    self._writer = Writer(self)
+        pass
+
     def __calculate_restart_date(self):
         """Calculate the date when logger must be restarted according to
         maxdays parameter.
@@ -643,14 +1156,194 @@ class Logger():
     def __check_file_stats(self):
         """Check the output file statistics to catch when current file must be
         closed and new one must be opened.
+        Check is repeated under the lock so when several threads see the full
+        file at the same time only one of them restarts the logger.
         """
+        if self.__must_restart() is True:
+            with self._lock:
+                if self.__must_restart() is True:
+                    self.restart()
+        pass
+
+    def __must_restart(self):
+        """Check whether current output file must be closed."""
         if self.root.file.status is True:
             if self._maxsize is not False:
-                if self.root.file.size is not None:
-                    if self.root.file.size > self._maxsize:
-                        self.restart()
-                        return
+                size = self.root.file.size
+                if size is not None and size > self._maxsize:
+                    return True
             if self._maxdays is not False:
                 if self.__restart_date.day == dt.datetime.now().day:
-                    self.restart()
-                    return
+                    return True
+        return False
+
+
+class Child(Logger):
+    """This class represents child logger - light logger with dotted name that
+    writes to the outputs of its parent.
+
+    Child shares outputs, formatter, header, sysinfo, metrics and all the
+    limits with the top logger so creating a child costs only a few
+    references. Only record type filters and record types can be changed.
+    Effective filters are resolved from the parent when child is created and
+    each time filters of the parent or the child are changed by
+    `configure()` or by the item assignment, not for each record.
+    Record types are copied from the parent when child is created.
+
+    Parameters
+    ----------
+    parent : Logger
+        The argument is used to set `parent` attribute.
+    name : str
+        The full dotted name of the child.
+
+    Attributes
+    ----------
+    parent : Logger
+        The parent logger.
+    base : Logger
+        The top logger which owns the outputs.
+    """
+
+    # Attributes that are never replaced in the top logger.
+    shared = ('root', 'console', 'file', 'email', 'html', 'table',
+              'recorder', 'formatter', 'header', 'sysinfo', 'metrics',
+              'throttle', 'grouper', 'messages', '_lock', '_tracebacks')
+
+    def __init__(self, parent, name):
+        base = parent.base if isinstance(parent, Child) is True else parent
+        self.parent = parent
+        self.base = base
+        self._name = name
+        for attr in self.shared:
+            self.__dict__[attr] = base.__dict__[attr]
+        self.rectypes = dict(parent.rectypes)
+        self.children = []
+        self._overrides = {}
+        self.filters = Filters(self)
+        self._resolve()
+        pass
+
+    def configure(self, info=None, debug=None, warning=None, error=None,
+                  critical=None):
+        """Change record type filters of the child. All other parameters are
+        inherited from the top logger and must be configured there.
+
+        Parameters
+        ----------
+        info : bool, float or Sampler, optional
+            The argument is used to filter info records.
+        debug : bool, float or Sampler, optional
+            The argument is used to filter debug records.
+        warning : bool, float or Sampler, optional
+            The argument is used to filter warning records.
+        error : bool, float or Sampler, optional
+            The argument is used to filter error records.
+        critical : bool, float or Sampler, optional
+            The argument is used to filter critical records.
+        """
+        for key, value in {'info': info, 'debug': debug, 'error': error,
+                           'warning': warning, 'critical': critical}.items():
+            if isinstance(value, float) is True:
+                value = Sampler(value)
+            if isinstance(value, (bool, Sampler)) is True:
+                self.filters[key] = value
+        pass
+
+    def close(self):
+        """Remove the child and its own children from the registry. Outputs
+        belong to the top logger and stay open.
+        """
+        for child in list(self.children):
+            child.close()
+        with self._lock:
+            if self in self.parent.children:
+                self.parent.children.remove(self)
+        if all_loggers.get(self._name) is self:
+            all_loggers.pop(self._name, None)
+        pass
+
+    def _after_fork(self):
+        """Take the new lock of the top logger in the child process."""
+        for attr in self.shared:
+            self.__dict__[attr] = self.base.__dict__[attr]
+        for value in self._overrides.values():
+            if isinstance(value, Sampler) is True:
+                value._after_fork()
+        for child in self.children:
+            child._after_fork()
+        pass
+
+    def _refilter(self, key, value):
+        """Keep the filter changed in the child as its own override."""
+        if value is None:
+            self._overrides.pop(key, None)
+        else:
+            self._overrides[key] = value
+        self._resolve()
+        pass
+
+    def _resolve(self):
+        """Resolve effective filters from the parent and own overrides."""
+        # Values are replaced in place so the change is not reported back.
+        dict.clear(self.filters)
+        dict.update(self.filters, self.parent.filters)
+        dict.update(self.filters, self._overrides)
+        for child in self.children:
+            child._resolve()
+        pass
+
+
+def _inherit(name):
+    """Create property that reads and writes the attribute of the top
+    logger.
+    """
+    def getter(self):
+        return getattr(self.base, name)
+
+    def setter(self, value):
+        setattr(self.base, name, value)
+        pass
+    return property(getter, setter)
+
+# Attributes that can be changed in the top logger after child is created.
+for attr in ('app', 'desc', 'version', 'suppressor', '_closed',
+             '_start_date', '_with_error', '_count_errors', '_writer',
+             '_deferred', '_profile', '_alarming', '_control', '_maxsize',
+             '_maxdays', '_maxlevel', '_maxerrors', '_Logger__restart_date'):
+    setattr(Child, attr, _inherit(attr))
+
+
+def _exit_all():
+    """Finish all live loggers at the end of the program."""
+    for logger in list(all_loggers.live):
+        logger._exit()
+    pass
+
+atexit.register(_exit_all)
+
+
+def _before_fork():
+    """Flush the buffers and hold file writes until the fork is done."""
+    # Console text buffered before the fork must not be printed twice.
+    try:
+        sys.stdout.flush()
+    except (AttributeError, ValueError, OSError):
+        pass
+    Handle._before_fork()
+    pass
+
+
+def _after_fork_in_child():
+    """Make all live loggers work in the child process."""
+    Handle._after_fork_in_child()
+    Sysinfo._lock = threading.Lock()
+    for logger in list(all_loggers.live):
+        logger._after_fork()
+    pass
+
+
+if hasattr(os, 'register_at_fork') is True:
+    os.register_at_fork(before=_before_fork,
+                        after_in_parent=Handle._after_fork_in_parent,
+                        after_in_child=_after_fork_in_child)
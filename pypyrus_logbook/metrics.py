@@ -0,0 +1,353 @@
+import http.server
+import os
+import threading
+
+
+class Metrics():
+    """This class represents metrics - set of counters and latency
+    histograms describing the work of the logger.
+
+    Each thread updates its own shard of values so no lock is taken on the
+    hot path. Shards are summed only when the snapshot is requested. Shards
+    of finished threads are added to the totals when new thread comes, so
+    short-lived threads do not grow the list of shards.
+    Histograms use buckets of powers of two nanoseconds so bucket of the
+    value is found by its bit length.
+
+    List of available metrics by now:
+
+    +--------------+---------+------------------------------------------+
+    |    Name      |  Label  |               Description                |
+    +==============+=========+==========================================+
+    |records       |rectype  |Number of written records                 |
+    +--------------+---------+------------------------------------------+
+    |filtered      |rectype  |Number of filtered records                |
+    +--------------+---------+------------------------------------------+
+    |bytes         |output   |Number of bytes written to the output     |
+    +--------------+---------+------------------------------------------+
+    |rotations     |         |Number of output file rotations           |
+    +--------------+---------+------------------------------------------+
+    |failures      |output   |Number of email and table failures        |
+    +--------------+---------+------------------------------------------+
+    |write_seconds |output   |Latency of the write to the output        |
+    +--------------+---------+------------------------------------------+
+
+    When profiling is enabled in the logger then the number of records,
+    written bytes and spent time are also collected for each call site.
+
+    Parameters
+    ----------
+    logger : Logger
+        The argument is used to set `logger` attribute.
+
+    Attributes
+    ----------
+    logger : Logger
+        The `Logger` object which is measured.
+    """
+
+    counters = {'records': ('rectype', 'Number of written records.'),
+                'filtered': ('rectype', 'Number of filtered records.'),
+                'bytes': ('output', 'Number of bytes written to the output.'),
+                'rotations': (None, 'Number of output file rotations.'),
+                'failures': ('output', 'Number of email and table failures.')}
+    histograms = {'write_seconds': ('output', 'Latency of the write to the '
+                                              'output in seconds.')}
+    buckets = 40
+
+    def __init__(self, logger):
+        self.logger = logger
+        self._local = threading.local()
+        self._shards = []
+        self._totals = ({}, {}, {})
+        self._lock = threading.Lock()
+        self._server = None
+        pass
+
+    def count(self, name, label=None, value=1):
+        """Increase the counter.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+        label : str, optional
+            The value of the counter label.
+        value : int, optional
+            The value that must be added to the counter. The default is 1.
+        """
+        try:
+            counters = self._local.counters
+        except AttributeError:
+            counters = self._register()[0]
+        key = (name, label)
+        counters[key] = counters.get(key, 0) + value
+        pass
+
+    def observe(self, name, label, value):
+        """Put the latency to the histogram.
+
+        Parameters
+        ----------
+        name : str
+            The name of the histogram.
+        label : str
+            The value of the histogram label.
+        value : int
+            The latency in nanoseconds.
+        """
+        try:
+            histograms = self._local.histograms
+        except AttributeError:
+            histograms = self._register()[1]
+        key = (name, label)
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = [0]*(self.buckets+2)
+        histogram[min(value.bit_length(), self.buckets)] += 1
+        histogram[-1] += value
+        pass
+
+    def profile(self, site, size, value, count=1):
+        """Add written record to the statistics of the call site.
+
+        Parameters
+        ----------
+        site : tuple
+            The call site presented as file name, object name and line
+            number.
+        size : int
+            The number of bytes written to the outputs.
+        value : int
+            The time spent on the record in nanoseconds.
+        count : int, optional
+            The number of records. The default is 1.
+        """
+        try:
+            sites = self._local.sites
+        except AttributeError:
+            sites = self._register()[2]
+        stats = sites.get(site)
+        if stats is None:
+            sites[site] = [count, size, value]
+        else:
+            stats[0] += count
+            stats[1] += size
+            stats[2] += value
+        pass
+
+    def written(self):
+        """Number of bytes written to all outputs by the current thread.
+
+        Returns
+        -------
+        size : int
+            The sum of `bytes` counters of the current thread.
+        """
+        try:
+            counters = self._local.counters
+        except AttributeError:
+            counters = self._register()[0]
+        return sum(value for (name, label), value in counters.items()
+                   if name == 'bytes')
+
+    def call_sites(self):
+        """Sum all thread shards and return statistics of call sites.
+
+        Returns
+        -------
+        sites : dict
+            The dictionary where keys are call sites presented as file name,
+            object name and line number and values are dictionaries with
+            `count`, `bytes` and `seconds` items.
+        """
+        sites = {}
+        with self._lock:
+            shards = [dict(shard[2]) for shard in self.__shards()]
+        for shard in shards:
+            for site, (count, size, value) in shard.items():
+                stats = sites.setdefault(site, {'count': 0, 'bytes': 0,
+                                                'seconds': 0})
+                stats['count'] += count
+                stats['bytes'] += size
+                stats['seconds'] += value/1e9
+        return sites
+
+    def snapshot(self):
+        """Sum all thread shards and return current values.
+
+        Returns
+        -------
+        snapshot : dict
+            The dictionary with `counters` and `histograms` items. Counters
+            are presented as dictionaries of label values and numbers.
+            Histograms are presented as dictionaries of label values and
+            dictionaries with `buckets`, `sum` and `count` items where
+            buckets are cumulative numbers by upper bounds in seconds.
+        """
+        counters, histograms = {}, {}
+        with self._lock:
+            shards = [(dict(shard[0]), dict(shard[1]))
+                      for shard in self.__shards()]
+        for shard_counters, shard_histograms in shards:
+            for (name, label), value in shard_counters.items():
+                values = counters.setdefault(name, {})
+                values[label] = values.get(label, 0) + value
+            for (name, label), value in shard_histograms.items():
+                values = histograms.setdefault(name, {})
+                total = values.get(label) or [0]*(self.buckets+2)
+                values[label] = [a+b for a, b in zip(total, list(value))]
+        for name, values in histograms.items():
+            for label, value in values.items():
+                buckets, cumulative = {}, 0
+                for i, number in enumerate(value[:-1]):
+                    cumulative += number
+                    buckets[2**i/1e9 if i < self.buckets else '+Inf'] = \
+                        cumulative
+                values[label] = {'buckets': buckets, 'sum': value[-1]/1e9,
+                                 'count': cumulative}
+        return {'counters': counters, 'histograms': histograms}
+
+    def prometheus(self):
+        """Return current values in Prometheus text exposition format.
+
+        Returns
+        -------
+        text : str
+            The metrics as a text.
+        """
+        snapshot = self.snapshot()
+        logger = self.logger.name.replace('\\', '\\\\').replace('"', '\\"')
+        lines = []
+        for name, (label_name, help) in self.counters.items():
+            metric = f'logbook_{name}_total'
+            lines.append(f'# HELP {metric} {help}')
+            lines.append(f'# TYPE {metric} counter')
+            for label, value in snapshot['counters'].get(name, {}).items():
+                labels = f'logger="{logger}"'
+                if label_name is not None:
+                    labels += f',{label_name}="{label}"'
+                lines.append(f'{metric}{{{labels}}} {value}')
+        for name, (label_name, help) in self.histograms.items():
+            metric = f'logbook_{name}'
+            lines.append(f'# HELP {metric} {help}')
+            lines.append(f'# TYPE {metric} histogram')
+            for label, value in snapshot['histograms'].get(name, {}).items():
+                labels = f'logger="{logger}",{label_name}="{label}"'
+                for bound, number in value['buckets'].items():
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} '
+                                 f'{number}')
+                lines.append(f'{metric}_sum{{{labels}}} {value["sum"]}')
+                lines.append(f'{metric}_count{{{labels}}} {value["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """Write current values in Prometheus text format to the file.
+        File is replaced atomically so it can be read by collector at any
+        moment.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file.
+        """
+        temp = f'{path}.tmp'
+        with open(temp, 'w') as fh:
+            fh.write(self.prometheus())
+        os.replace(temp, path)
+        pass
+
+    def serve(self, host='127.0.0.1', port=0):
+        """Start tiny HTTP server in the background thread that returns
+        current values in Prometheus text format.
+
+        Parameters
+        ----------
+        host : str, optional
+            The argument is used to define the host on which server listens.
+            The default is 127.0.0.1.
+        port : int, optional
+            The argument is used to define the port on which server listens.
+            The default is 0 that means any free port, the bound one is
+            returned.
+
+        Returns
+        -------
+        address : tuple
+            The host and port on which server listens.
+        """
+        if self._server is None:
+            metrics = self
+
+            class Handler(http.server.BaseHTTPRequestHandler):
+                def do_GET(self):
+                    body = metrics.prometheus().encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type',
+                                     'text/plain; version=0.0.4')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    pass
+
+                def log_message(self, *args):
+                    pass
+
+            server = http.server.ThreadingHTTPServer((host, port), Handler)
+            thread = threading.Thread(target=server.serve_forever,
+                                      name='LogbookMetrics', daemon=True)
+            thread.start()
+            self._server = server
+        return self._server.server_address
+
+    def shutdown(self):
+        """Stop HTTP server if it is running."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        pass
+
+    def _after_fork(self):
+        """Start the values from zero in the child process. HTTP server
+        stays in the parent process.
+        """
+        self._local = threading.local()
+        self._shards = []
+        self._totals = ({}, {}, {})
+        self._lock = threading.Lock()
+        self._server = None
+        pass
+
+    def _register(self):
+        """Create the shard of values for the current thread."""
+        shard = ({}, {}, {})
+        self._local.counters, self._local.histograms, self._local.sites = \
+            shard
+        with self._lock:
+            self.__fold()
+            self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def __shards(self):
+        """List the totals and shards of all threads. Lock must be held."""
+        return [self._totals] + [shard for thread, shard in self._shards]
+
+    def __fold(self):
+        """Add shards of finished threads to the totals. Lock must be held."""
+        counters, histograms, sites = self._totals
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive() is True:
+                alive.append((thread, shard))
+                continue
+            for key, value in shard[0].items():
+                counters[key] = counters.get(key, 0) + value
+            for key, value in shard[1].items():
+                total = histograms.get(key) or [0]*(self.buckets+2)
+                histograms[key] = [a+b for a, b in zip(total, value)]
+            for key, value in shard[2].items():
+                total = sites.get(key) or [0, 0, 0]
+                sites[key] = [a+b for a, b in zip(total, value)]
+        self._shards = alive
+        pass
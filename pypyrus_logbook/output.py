@@ -1,15 +1,22 @@
+import collections
 import datetime as dt
 import functools
+import html
 import os
 import smtplib
 import sqlalchemy as sql
+import threading
+import time
 
 from email import encoders
 from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+from .reader import Reader
 from .record import Record
+from .record import catch_frame
+from .record import encode_value
 from .utils import py_dir
 
 def you_shall_not_pass(func):
@@ -57,6 +64,10 @@ class Branch(Output):
     """This class is a parent for each low-level output object e.g. console,
     file, email, database table, and HTML document.
 
+    Each branch has its own lock so records written from different threads
+    never interleave inside one output while different outputs are written
+    in parallel.
+
     Parameters
     ----------
     root : Output
@@ -75,6 +86,7 @@ class Branch(Output):
     def __init__(self, root, status=False):
         super().__init__(status=status)
         self._root = root
+        self._lock = threading.Lock()
         pass
 
     @property
@@ -82,13 +94,23 @@ class Branch(Output):
         """The low-level `Output` that is a root of this branch."""
         return self._root
 
+    def release(self):
+        """Release files and connections held by the output."""
+        pass
+
+    def _after_fork(self):
+        """Create new lock in the child process."""
+        self._lock = threading.Lock()
+        pass
+
 class Root(Output):
     """This class represents the output root - low-level output object that is
     literally a bridge between logger inputs and high-level outputs like
     console. file, email, database table and HTML document.
 
     Constructor of this class also creates high-level outputs as `Root`
-    attributes like `console`, `file`, `email`, `html` and `table`.
+    attributes like `console`, `file`, `email`, `html`, `table` and
+    `recorder`.
 
     Parameters
     ----------
@@ -106,6 +128,9 @@ class Root(Output):
         The argument is used for `status` argument of `HTML` class.
     table : bool, optional
         The argument is used for `status` argument of `Table` class.
+    recorder : int or bool, optional
+        The argument is used for `status` and `size` arguments of `Recorder`
+        class.
     status : bool, optional
         The overall status of the `Root`.
     directory : str, optional
@@ -114,6 +139,10 @@ class Root(Output):
         The argument is used for `name` argument of `File` class.
     extension : str, optional
         The argument is used for `extension` argument of `File` class.
+    json : bool, optional
+        The argument is used for `json` argument of `File` class.
+    index : int or bool, optional
+        The argument is used for `index` argument of `File` class.
     smtp : dict, optional
         The argument is used to pass `address`, `host`, `port`, `tls`, `user`,
         `password` and `recipients` arguments to `Email` class.
@@ -138,18 +167,21 @@ class Root(Output):
         The `HTML` object output.
     table : Table
         The `Table` object output.
+    recorder : Recorder
+        The `Recorder` object output.
     """
 
     def __init__(self, logger, status=True, console=True, file=True,
-                 email=False, html=False, table=False, directory=None,
-                 filename=None, extension=None, smtp=None, db=None):
+                 email=False, html=False, table=False, recorder=False,
+                 directory=None, filename=None, extension=None, json=None,
+                 index=None, smtp=None, db=None):
         super().__init__(status=status)
         self.logger = logger
 
         self.console = Console(self, status=console)
 
         path = dict(dir=directory, name=filename, ext=extension)
-        self.file = File(self, status=file, **path)
+        self.file = File(self, status=file, json=json, index=index, **path)
 
         smtp = smtp if isinstance(smtp, dict) is True else {}
         self.email = Email(self, status=email, **smtp)
@@ -158,6 +190,13 @@ class Root(Output):
 
         db = db if isinstance(db, dict) is True else {}
         self.table = Table(self, status=table, **db)
+
+        size = recorder if isinstance(recorder, bool) is False else None
+        self.recorder = Recorder(self, status=bool(recorder), size=size)
+
+        # Writable outputs with the names used in metrics.
+        self.branches = (('console', self.console), ('file', self.file),
+                         ('html', self.html), ('recorder', self.recorder))
         pass
 
     @you_shall_not_pass
@@ -169,10 +208,32 @@ class Root(Output):
         record : str or Record
             The data that must be written to writable outputs.
         """
-        if isinstance(record, Record) is True: record = record.create()
-        self.console.write(record)
-        self.file.write(record)
-        self.html.write(record)
+        # Record is sent to outputs as it is because each output decides
+        # itself how record must be presented.
+        # Latency of each output is measured.
+        metrics = self.logger.metrics
+        start = time.perf_counter_ns()
+        for name, branch in self.branches:
+            if branch.status is True:
+                begin = time.perf_counter_ns()
+                branch.write(record)
+                end = time.perf_counter_ns()
+                metrics.observe('write_seconds', name, end-begin)
+        metrics.observe('write_seconds', 'root', time.perf_counter_ns()-start)
+        pass
+
+    def release(self):
+        """Release files and connections held by all outputs."""
+        for branch in (self.console, self.file, self.email, self.html,
+                       self.table, self.recorder):
+            branch.release()
+        pass
+
+    def _after_fork(self):
+        """Prepare all outputs for the work in the child process."""
+        for branch in (self.console, self.file, self.email, self.html,
+                       self.table, self.recorder):
+            branch._after_fork()
         pass
 
 class Console(Branch):
@@ -199,15 +260,249 @@ class Console(Branch):
 
         Parameters
         ----------
-        record : str
+        record : str or Record
             The string that must be written to system stdout.
         """
-        print(record, end='')
+        if isinstance(record, Record) is True: record = record.create()
+        with self._lock:
+            print(record, end='')
+        # Bytes are counted as in the file, ASCII text is not encoded.
+        size = len(record) if record.isascii() is True \
+               else len(record.encode())
+        self.root.logger.metrics.count('bytes', 'console', size)
+        pass
+
+class Handle():
+    """This class represents the handle of output file shared by all `File`
+    outputs with the same path in the process.
+
+    Outputs of different loggers which write to the same file use one
+    buffered writer, one size counter and one index. Handle is opened by the
+    first write and closed when the last output releases it. Rotation is
+    coordinated: the first output that rotates the file chooses the path of
+    the next file and all other outputs follow it, so only one new file is
+    started.
+
+    Parameters
+    ----------
+    path : str
+        The argument is used to set `path` attribute.
+
+    Attributes
+    ----------
+    path : str
+        The path to the file.
+    size : int or None
+        The current size of the file. It is None until file is opened.
+    modified : datetime.datetime or None
+        The last time when file was modified by this process.
+    successor : Handle or None
+        The handle of the next file chosen by rotation.
+    users : int
+        The number of outputs that use the handle.
+    """
+
+    handles = {}
+    _held = []
+    # Reentrant because output collected by garbage collector releases its
+    # handle in the middle of any other call.
+    _lock = threading.RLock()
+
+    def __init__(self, path):
+        self.path = path
+        self.size = None
+        self.modified = None
+        self.successor = None
+        self.users = 0
+        self._key = os.path.realpath(path)
+        self._lock = threading.Lock()
+        self._handler = None
+        self._index = None
+        self._bucket = None
+        pass
+
+    @classmethod
+    def acquire(cls, path, unique=False):
+        """Get the handle of the path or create it if it does not exist yet.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file.
+        unique : bool, optional
+            The argument is used to add a number to the file name while file
+            with such name exists or is used by other handle.
+
+        Returns
+        -------
+        handle : Handle
+            The `Handle` object of the path.
+        """
+        with cls._lock:
+            if unique is True:
+                root, ext = os.path.splitext(path)
+                number = 0
+                while (os.path.exists(path) is True
+                       or os.path.realpath(path) in cls.handles):
+                    number += 1
+                    path = f'{root}-{number}{ext}'
+            key = os.path.realpath(path)
+            handle = cls.handles.get(key)
+            if handle is None:
+                handle = cls.handles[key] = cls(path)
+            handle.users += 1
+        return handle
+
+    def release(self):
+        """Stop using the handle. File is closed when it is released by all
+        outputs.
+        """
+        with Handle._lock:
+            self.users -= 1
+            if self.users > 0:
+                return
+            if Handle.handles.get(self._key) is self:
+                del Handle.handles[self._key]
+        self.close()
+        # Next file is not reserved anymore.
+        if self.successor is not None:
+            self.successor.release()
+        pass
+
+    @classmethod
+    def _before_fork(cls):
+        """Wait for the writes in progress and hold the new ones until the
+        fork is done so buffers of all files are empty in the child.
+        """
+        with cls._lock:
+            held = list(cls.handles.values())
+        for handle in held:
+            handle._lock.acquire()
+        cls._held = held
+        pass
+
+    @classmethod
+    def _after_fork_in_parent(cls):
+        """Let the writes continue in the parent process."""
+        held, cls._held = cls._held, []
+        for handle in held:
+            handle._lock.release()
+        pass
+
+    @classmethod
+    def _after_fork_in_child(cls):
+        """Create new locks in the child process. Files are kept open
+        because appends from both processes do not overwrite each other.
+        """
+        cls._lock = threading.RLock()
+        cls._held = []
+        for handle in cls.handles.values():
+            handle._lock = threading.Lock()
+        pass
+
+    def close(self):
+        """Close the file and its index."""
+        with self._lock:
+            for handler in (self._handler, self._index):
+                if handler is not None:
+                    handler.close()
+            self._handler = None
+            self._index = None
+            self._bucket = None
+        pass
+
+    def rotate(self, path):
+        """Choose the next file. It is chosen only once and all outputs
+        rotating this file get the same one. Next file is reserved until
+        this one is released by all outputs.
+
+        Parameters
+        ----------
+        path : str
+            The path to the next file proposed by output.
+
+        Returns
+        -------
+        handle : Handle
+            The handle of the next file.
+        """
+        with self._lock:
+            if self.successor is None:
+                self.successor = self.acquire(path, unique=True)
+            return self.successor
+
+    def write(self, data, index=False, date=None):
+        """Append data to the file. Open the file and its index if they are
+        not opened yet.
+
+        Parameters
+        ----------
+        data : bytes
+            The encoded record.
+        index : int or bool, optional
+            The width in seconds of time buckets in index file. False means
+            that index is not used.
+        date : datetime.datetime, optional
+            The time of the record used to find its bucket in index file.
+            The default is the current time.
+        """
+        with self._lock:
+            if self._handler is None:
+                self.__open()
+            if index is not False and self._index is None:
+                self.__open_index(index)
+
+            # Register the offset of the first record in each time bucket.
+            self.modified = dt.datetime.now()
+            if self._index is not None:
+                bucket = int((date or self.modified).timestamp())
+                bucket = bucket // index * index
+                # Records of several threads come a bit out of order so
+                # buckets only grow.
+                if self._bucket is None or bucket > self._bucket:
+                    self._bucket = bucket
+                    self._index.write(f'{bucket}\t{self.size}\n')
+                    self._index.flush()
+
+            self._handler.write(data)
+            self._handler.flush()
+            # File can be appended by other processes so the size is taken
+            # from the file itself.
+            self.size = os.fstat(self._handler.fileno()).st_size
+        pass
+
+    def __open(self):
+        """Open the file. Create the folder if it does not exist."""
+        dirname = os.path.dirname(self.path)
+        os.makedirs(dirname, exist_ok=True)
+        self._handler = open(self.path, 'ab')
+        self.size = os.fstat(self._handler.fileno()).st_size
+        pass
+
+    def __open_index(self, index):
+        """Open the index of the file. Continue from the last bucket written
+        to the index so the same bucket is not registered again.
+        """
+        path = f'{self.path}.idx'
+        exists = os.path.exists(path)
+        self._index = open(path, 'a')
+        if exists is False:
+            self._index.write(f'width\t{index}\n')
+        else:
+            with open(path, 'rb') as fh:
+                fh.seek(max(os.fstat(fh.fileno()).st_size-64, 0))
+                lines = fh.read().split(b'\n')
+            key = lines[-2].split(b'\t')[0] if len(lines) > 1 else b''
+            if key.isdigit() is True:
+                self._bucket = max(int(key), self._bucket or 0)
         pass
 
 class File(Branch):
     """This class represents file output.
 
+    File itself is opened through the `Handle` shared by all file outputs
+    with the same path in the process.
+
     Parameters
     ----------
     root : Output
@@ -220,6 +515,10 @@ class File(Branch):
         The argument is used to set `name` attribute.
     ext : str, optional
         The argument is used to set `ext` attribute.
+    json : bool, optional
+        The argument is used to set `json` attribute.
+    index : int or bool, optional
+        The argument is used to set `index` attribute.
 
     Attributes
     ----------
@@ -235,14 +534,35 @@ class File(Branch):
         the start date of logging in format *YYYYMMDDHHMISS*.
     ext : str
         The extension of output file. By default we use *log* extension.
+    json : bool
+        The flag of JSON Lines output format. When it is enabled each record
+        is written as a single JSON object with record forms as fields. By
+        default it is disabled.
+    index : int or bool
+        The width in seconds of time buckets in sidecar index file. Index
+        file is stored near the output file with additional *idx* extension
+        and maps the start of each time bucket to the byte offset of its
+        first record. It is used by `read()` method to find the records by
+        dates without reading the whole files. True means buckets of one
+        minute. By default index is disabled.
     """
 
-    def __init__(self, root, status=True, dir=None, name=None, ext=None):
+    def __init__(self, root, status=True, dir=None, name=None, ext=None,
+                 json=None, index=None):
         super().__init__(root, status=status)
         dir = dir or os.path.join(py_dir, 'logs')
         name = name or '{root.logger.start_date:%Y%m%d%H%M%S}'
         ext = ext or 'log'
-        self.configure(dir=dir, name=name, ext=ext)
+        json = json or False
+        index = index or False
+        self._path = None
+        self._handle = None
+        self.configure(dir=dir, name=name, ext=ext, json=json, index=index)
+        pass
+
+    def __del__(self):
+        # Output of the collected logger must not keep the file open.
+        self.release()
         pass
 
     @property
@@ -253,14 +573,17 @@ class File(Branch):
     @property
     def modified(self):
         """Last time when file was modified."""
-        return self._modified
+        handle = self._handle
+        return handle.modified if handle is not None else None
 
     @property
     def size(self):
         """Current file size."""
-        return self._size
+        handle = self._handle
+        return handle.size if handle is not None else None
 
-    def configure(self, dir=None, name=None, ext=None):
+    def configure(self, dir=None, name=None, ext=None, json=None,
+                  index=None):
         """Change output file parameters.
 
         Parameters
@@ -276,28 +599,60 @@ class File(Branch):
         ext : str, optional
             The argument is used to define the extension of output file. By
             default we use *log* extension.
+        json : bool, optional
+            The argument is used to enable or disable JSON Lines output
+            format. New output file will be opened so formats are never mixed
+            in one file.
+        index : int or bool, optional
+            The argument is used to define the width in seconds of time
+            buckets in sidecar index file. True means one minute and False
+            disables the index.
         """
         if isinstance(dir, str) is True: self.dir = dir
         if isinstance(name, str) is True: self.name = name
         if isinstance(ext, str) is True: self.ext = ext
-        if dir is not None or name is not None or ext is not None:
+        if isinstance(json, bool) is True: self.json = json
+        if isinstance(index, bool) is True:
+            self.index = 60 if index is True else False
+        elif isinstance(index, int) is True:
+            self.index = index
+        if dir is not None or name is not None or ext is not None \
+        or json is not None or index is not None:
             self.new()
         pass
 
     @you_shall_not_pass
-    def new(self):
-        """Open new output file."""
+    def new(self, unique=False):
+        """Open new output file.
+
+        Parameters
+        ----------
+        unique : bool, optional
+            The argument is used to add a number to the file name when file
+            with the same name already exists. It prevents rotation from
+            reopening the same file. When other outputs share the current
+            file only the first of them chooses the next file and all others
+            follow it.
+        """
         # Define new path.
         head = self.dir
         tail = f'{self.name}.{self.ext}'
         datetime = self.root.logger.start_date
         path = os.path.join(head, tail)
-        self._path = path.format(root=self.root, datetime=datetime)
-
-        # Handler and file statistics must be purged.
-        self.__handler = None
-        self._modified = None
-        self._size = None
+        path = path.format(root=self.root, datetime=datetime)
+
+        # Current handle is replaced by the handle of the new path.
+        with self._lock:
+            old = self._handle
+            if unique is True and old is not None:
+                path = old.rotate(path).path
+                handle = Handle.acquire(path)
+            else:
+                handle = Handle.acquire(path, unique=unique)
+            self._path = handle.path
+            self._handle = handle
+        if old is not None:
+            old.release()
         pass
 
     @you_shall_not_pass
@@ -310,28 +665,82 @@ class File(Branch):
 
         Parameters
         ----------
-        record : str
-            The string that must be written to file.
+        record : str or Record
+            The string or record that must be written to file.
         """
-        # Create path and open file handler if it is not opened yet.
-        if self.__handler is None:
-            # Check the directories.
-            dirname = os.path.dirname(self._path)
-            if os.path.exists(dirname) is False: os.makedirs(dirname)
-            # Make file.
-            self.__handler = open(self._path, 'a')
-
         # We should write to handler only string values.
         # So if data presented as record.Record() object it must be converted
-        # to string value by using Record.create() method.
-        self.__handler.write(record)
-        self.__handler.flush()
+        # to string value by using Record.create() method or Record.serialize()
+        # method in case of JSON Lines format.
+        date = None
+        if isinstance(record, Record) is True:
+            date = record.datetime
+        if self.json is True:
+            if isinstance(record, Record) is True:
+                record = record.serialize()
+            elif record.strip() != '':
+                record = f'{{"text":{encode_value(record)}}}\n'
+            else:
+                return
+        elif isinstance(record, Record) is True:
+            record = record.create()
+
+        # String is prepared before the lock so it is held only for the
+        # write itself.
+        data = record.encode()
+        with self._lock:
+            # Take the handle again if it was released.
+            if self._handle is None:
+                self._handle = Handle.acquire(self._path)
+            self._handle.write(data, self.index, date)
+        self.root.logger.metrics.count('bytes', 'file', len(data))
+        pass
 
-        # Update statistics that is requeired for other logger functionality.
-        self._modified = dt.datetime.now()
-        self._size = os.stat(self._path).st_size
+    def release(self):
+        """Release the handle of output file. File is closed when no other
+        output uses it and opened again by the next write.
+        """
+        with self._lock:
+            handle, self._handle = self._handle, None
+        if handle is not None:
+            handle.release()
         pass
 
+    def read(self, start=None, end=None):
+        """Read records from all output files in `dir` folder.
+        Output files with sidecar index are read only from the offsets
+        covering requested dates.
+
+        Parameters
+        ----------
+        start : datetime.datetime, optional
+            The argument is used to define the earliest date of record.
+        end : datetime.datetime, optional
+            The argument is used to define the latest date of record.
+
+        Returns
+        -------
+        records : generator of dict
+            The forms of the found records.
+        """
+        return Reader(self).search(start=start, end=end)
+
+    def follow(self, **kwargs):
+        """Follow output file and yield new records as they are appended.
+        Reading continues with the new file when logger is restarted.
+
+        Parameters
+        ----------
+        **kwargs
+            The keyword arguments used for `Reader.follow()` method.
+
+        Returns
+        -------
+        records : generator of dict
+            The forms of the new records.
+        """
+        return Reader(self).follow(**kwargs)
+
 class Email(Branch):
     """That class represents SMTP server and email used to send messages,
     notifications and alarms.
@@ -380,6 +789,8 @@ class Email(Branch):
     def __init__(self, root, status=False, address=None, host=None, port=None,
                  tls=None, user=None, password=None, recipients=None):
         super().__init__(root, status=status)
+        self.__password = None
+        self._reconnect = False
         self.configure(address=address, host=host, port=port, tls=tls,
                        user=user, password=password, recipients=recipients)
         pass
@@ -425,6 +836,7 @@ class Email(Branch):
             try:
                 self.connect(password)
             except:
+                self.root.logger.metrics.count('failures', 'email')
                 self.root.logger.warning('Cannot connect to SMTP server')
                 self.root.logger.warning()
                 self._status = False
@@ -449,6 +861,9 @@ class Email(Branch):
         or isinstance(self.port, int) is False:
             raise AttributeError('incorrect port')
 
+        # Password is kept to connect again in the child process.
+        self.__password = password
+
         # Creating connection with or without TLS.
         self._server = smtplib.SMTP(self.host, self.port)
         if self.tls is True:
@@ -469,6 +884,27 @@ class Email(Branch):
             self._server.quit()
         pass
 
+    def release(self):
+        """Disconnect from SMTP server."""
+        with self._lock:
+            server = self.__dict__.pop('_server', None)
+            self._reconnect = False
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+        pass
+
+    def _after_fork(self):
+        """Drop the connection inherited from the parent process. The new
+        one is opened by the first message sent from the child.
+        """
+        super()._after_fork()
+        if self.__dict__.pop('_server', None) is not None:
+            self._reconnect = True
+        pass
+
     @you_shall_not_pass
     def send(self, subject, text, recipients=None, attachment=None,
              type='html'):
@@ -525,16 +961,24 @@ class Email(Branch):
                                     f"attachment; filename={filename}")
                     message.attach(part)
 
-            # Finally send message.
-            self._server.send_message(message)
+            # Finally send message. Connection is opened again if it was
+            # dropped after the fork.
+            try:
+                if self._reconnect is True:
+                    self._reconnect = False
+                    self.connect(self.__password)
+                self._server.send_message(message)
+            except:
+                self.root.logger.metrics.count('failures', 'email')
+                raise
         pass
 
     @you_shall_not_pass
-    def alarm(self, with_log=True):
+    def alarm(self, with_log=None):
         """Send special alarm message. That message has the name of the
-        application in the subject, log header in the text and also log file
-        as an attahcment if it is enabled and if parameter with_log is set
-        to True.
+        application in the subject, log header and summary of exceptions in
+        the text and also log file as an attahcment if it is enabled and if
+        parameter with_log is set to True.
         That method is a generic way used in Logger write methods to inform
         user about occured application errors. But it also can be used by
         user outside of the errors.
@@ -543,13 +987,28 @@ class Email(Branch):
         ----------
         with_log : bool, optional
             The argument is used for attachment of logging output file to
-            the alarm message. The default is True.
+            the alarm message. By default log is attached only when grouping
+            of exceptions is disabled, otherwise summary of exceptions
+            replaces it.
         """
-        subject = f'ALARM in {self.root.logger.app}!'
+        logger = self.root.logger
+        subject = f'ALARM in {logger.app}!'
 
-        text = self.root.logger.header.create()
+        text = logger.header.create()
+        if len(logger.grouper.groups) > 0:
+            summary = html.escape(logger.grouper.report())
+            text = f'{text}\n{summary}\n'
         text = f'<pre>{text}</pre>'
-        text = MIMEText(text, 'html')
+        text = [MIMEText(text, 'html')]
+        if with_log is None:
+            with_log = logger.grouper.window is False
+
+        # Last records from flight recorder are attached as a text file.
+        if self.root.recorder.last is not None:
+            part = MIMEText(self.root.recorder.last, 'plain')
+            part.add_header('Content-Disposition', 'attachment',
+                            filename='recorder.log')
+            text.append(part)
 
         if with_log is True and self.root.file.status is True:
             attachment = self.root.file.path
@@ -568,20 +1027,336 @@ class HTML(Branch):
     """This class represents HTML document which is a writable text output
     that can be used when you need to style your logs or to display them on
     some web application like dashboard.
+
+    Document is split into pages of limited size. Each record is appended to
+    the current page as a table row so page is never rewritten. When page
+    reaches the maximum size it is closed and the new one is started. The
+    index page contains links to all pages of the document.
+
+    Parameters
+    ----------
+    root : Output
+        The argument is used to set `root` attribute.
+    status : bool, optional
+        The argument is used to open or close the output.
+    dir : str, optional
+        The argument is used to set `dir` attribute.
+    filename : str, optional
+        The argument is used to set `filename` attribute.
+    maxsize : int, optional
+        The argument is used to set `maxsize` attribute.
+
+    Attributes
+    ----------
+    root : Root
+        The low-level `Output` that is a root of this branch.
+    status : bool
+        The status of the output.
+    dir : str
+        The path to folder in which document must be created.
+        By default we use the *logs* folder in current location.
+    filename : str
+        The name of document index page. Pages have the same name with
+        additional page number. By default we use the string representing
+        the start date of logging in format *YYYYMMDDHHMISS*.
+    maxsize : int
+        The maximum size of one page in bytes. The default is 1 Mb.
+    """
+
+    head = ('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            '<title>{title}</title>\n<style>\n'
+            'body {{font-family: monospace;}}\n'
+            'table {{border-collapse: collapse;}}\n'
+            'td {{padding: 0 8px; vertical-align: top;}}\n'
+            'pre {{margin: 0;}}\n'
+            '.debug {{color: gray;}}\n'
+            '.warning {{color: darkorange;}}\n'
+            '.error, .critical {{color: red;}}\n'
+            '</style>\n</head>\n<body>\n')
+    tail = '</body>\n</html>\n'
+
+    def __init__(self, root, status=False, dir=None, filename=None,
+                 maxsize=None):
+        super().__init__(root, status=status)
+        dir = dir or os.path.join(py_dir, 'logs')
+        filename = filename or '{root.logger.start_date:%Y%m%d%H%M%S}'
+        maxsize = maxsize or 1024*1024
+        self.__handler = None
+        self._path = None
+        self._page = 0
+        self._size = 0
+        self.configure(dir=dir, filename=filename, maxsize=maxsize)
+        pass
+
+    @property
+    def path(self):
+        """Absolute path to document index page."""
+        return self._path
+
+    @property
+    def page(self):
+        """Number of current page."""
+        return self._page
+
+    def configure(self, dir=None, filename=None, maxsize=None):
+        """Configure HTML document output.
+
+        Parameters
+        ----------
+        dir : str, optional
+            The argument is used to define path to folder in which document
+            must be created.
+        filename : str, optional
+            The argument is used to define the name of document index page.
+        maxsize : int, optional
+            The argument is used to define the maximum size of one page in
+            bytes.
+        """
+        if isinstance(dir, str) is True: self.dir = dir
+        if isinstance(filename, str) is True: self.filename = filename
+        if isinstance(maxsize, int) is True: self.maxsize = maxsize
+        if dir is not None or filename is not None:
+            self.new()
+        pass
+
+    @you_shall_not_pass
+    def new(self):
+        """Start new HTML document."""
+        self._path = self.__define_path()
+
+        # Current page must be finished.
+        with self._lock:
+            if self.__handler is not None:
+                self.__handler.write(f'</table>\n{self.tail}'.encode())
+                self.__handler.close()
+            self.__handler = None
+            self._page = 0
+            self._size = 0
+        pass
+
+    @you_shall_not_pass
+    def write(self, record):
+        """Append record to the current page of the document as a table row.
+        New page is started when current one reaches the maximum size.
+
+        Parameters
+        ----------
+        record : str or Record
+            The string or record that must be written to document.
+        """
+        if isinstance(record, Record) is True:
+            rectype = record.rectype.lower()
+            cells = (record.isodate, record.rectype, record.objname,
+                     record.flname, record.thread)
+            cells = ''.join(f'<td>{html.escape(cell)}</td>' for cell in cells)
+            message = html.escape(record.message)
+            row = (f'<tr class="{rectype}">{cells}'
+                   f'<td><pre>{message}</pre></td></tr>\n')
+        elif record.strip() != '':
+            text = html.escape(record.rstrip('\n'))
+            row = f'<tr><td colspan="6"><pre>{text}</pre></td></tr>\n'
+        else:
+            return
+
+        row = row.encode()
+        with self._lock:
+            if self.__handler is None or self._size > self.maxsize:
+                self.__next()
+            self.__handler.write(row)
+            self.__handler.flush()
+            self._size += len(row)
+        self.root.logger.metrics.count('bytes', 'html', len(row))
+        pass
+
+    def release(self):
+        """Finish current page of the document and close it. Next write
+        starts the new page.
+        """
+        with self._lock:
+            if self.__handler is not None:
+                self.__handler.write(f'</table>\n{self.tail}'.encode())
+                self.__handler.close()
+            self.__handler = None
+        pass
+
+    def __next(self):
+        """Finish current page, start the next one and add link to it to
+        the index page.
+        """
+        # Output enabled after creation has no path yet.
+        if self._path is None:
+            self._path = self.__define_path()
+
+        # Check the directories.
+        dirname = os.path.dirname(self._path)
+        if os.path.exists(dirname) is False: os.makedirs(dirname)
+
+        if self.__handler is not None:
+            self.__handler.write(f'</table>\n{self.tail}'.encode())
+            self.__handler.close()
+
+        # Pages already written by other runs or processes are never
+        # overwritten, page is taken only when it is created by this call.
+        root, ext = os.path.splitext(self._path)
+        while True:
+            self._page += 1
+            path = f'{root}_{self._page:04}{ext}'
+            try:
+                self.__handler = open(path, 'xb')
+            except FileExistsError:
+                continue
+            break
+        name = os.path.basename(path)
+        title = html.escape(os.path.basename(root))
+
+        # Index page is created once and then only appended.
+        try:
+            with open(self._path, 'xb') as fh:
+                fh.write(self.head.format(title=title).encode())
+        except FileExistsError:
+            pass
+        with open(self._path, 'ab') as fh:
+            date = dt.datetime.now().isoformat(sep=' ', timespec='seconds')
+            link = f'<p><a href="{name}">Page {self._page}</a> {date}</p>\n'
+            fh.write(link.encode())
+
+        self._size = self.__handler.write(
+            f'{self.head.format(title=f"{title} {self._page}")}<table>\n'
+            .encode())
+        pass
+
+    def __define_path(self):
+        """Make path to document index page from the current settings."""
+        path = os.path.join(self.dir, f'{self.filename}.html')
+        datetime = self.root.logger.start_date
+        return path.format(root=self.root, datetime=datetime)
+
+class Recorder(Branch):
+    """This class represents flight recorder - an in-memory ring buffer that
+    keeps the last records including the ones that were filtered out.
+    When error occurs the buffer is attached to the alarm message and the
+    filtered records from it are dumped to the output file, that already has
+    the others, so the context of the error is never lost.
+
+    Written records are kept as they are. Filtered records are captured as
+    raw fields and formatted only when buffer is dumped. Note that user
+    defined forms are kept by reference so their values are taken at the
+    moment of the dump.
+
+    Parameters
+    ----------
+    root : Output
+        The argument is used to set `root` attribute.
+    status : bool, optional
+        The argument is used to open or close the output.
+    size : int, optional
+        The argument is used to set `size` attribute.
+
+    Attributes
+    ----------
+    root : Root
+        The low-level `Output` that is a root of this branch.
+    status : bool
+        The status of the output.
+    size : int
+        The maximum number of records in the buffer. The default is 1000.
+    last : str or None
+        The last dump of the whole buffer.
     """
 
-    def __init__(self, root, status=False, dir=None, filename=None):
+    def __init__(self, root, status=False, size=None):
         super().__init__(root, status=status)
+        self.last = None
+        self.configure(size=size or 1000)
         pass
 
-    def configure(self, dir=None, filename=None):
-        """Configure HTML document output."""
+    def configure(self, size=None):
+        """Configure flight recorder.
+
+        Parameters
+        ----------
+        size : int, optional
+            The argument is used to define the maximum number of records in
+            the buffer.
+        """
+        if isinstance(size, int) is True:
+            self.size = size
+            self.buffer = collections.deque(maxlen=size)
         pass
 
     @you_shall_not_pass
     def write(self, record):
+        """Put written record to the buffer.
+
+        Parameters
+        ----------
+        record : str or Record
+            The string or record that was written to the outputs.
+        """
+        with self._lock:
+            self.buffer.append(record)
         pass
 
+    @you_shall_not_pass
+    def capture(self, rectype, message, kwargs):
+        """Put filtered record to the buffer as raw fields.
+
+        Parameters
+        ----------
+        rectype : str
+            The type of record.
+        message : str
+            The message of record.
+        kwargs : dict
+            The user defined forms of record.
+        """
+        frame = catch_frame()
+        thread = threading.current_thread().name
+        with self._lock:
+            self.buffer.append((time.time_ns(), rectype, message, kwargs,
+                                frame.f_code, frame.f_lineno, thread))
+        pass
+
+    @you_shall_not_pass
+    def dump(self):
+        """Format all records in the buffer and keep them in `last` for the
+        alarm message. Only filtered records are written to the output
+        file. After that buffer is emptied.
+
+        Returns
+        -------
+        text : str
+            The dumped records.
+        """
+        logger = self.root.logger
+        formatter = logger.formatter
+        border = formatter.div*formatter.length
+        with self._lock:
+            buffer = self.buffer
+            self.buffer = collections.deque(maxlen=self.size)
+        records, filtered = [], []
+        cache = {}
+        for record in buffer:
+            captured = isinstance(record, tuple)
+            if captured is True:
+                record = Record.restore(logger, *record, cache=cache)
+            if isinstance(record, Record) is True:
+                record = record.create()
+            records.append(record)
+            if captured is True:
+                filtered.append(record)
+        self.last = text = self.__frame(border, 'LAST', records)
+        if len(filtered) > 0:
+            self.root.file.write(self.__frame(border, 'FILTERED', filtered))
+        return text
+
+    def __frame(self, border, title, records):
+        """Put the records between the borders with the title."""
+        lines = [f'{border}\n',
+                 f'\tFLIGHT RECORDER: {title} {len(records)} RECORDS\n',
+                 f'{border}\n', *records, f'{border}\n']
+        return ''.join(lines)
+
 class Table(Branch):
     """This class represents a database table which can be used to generate
     record in database table and update its fields with necessary values
@@ -644,6 +1419,8 @@ class Table(Branch):
         Parameter used to pass already predefined
         sqlalchemy.engine.base.Connection or sqlalchemy.engine.base.Engine
         objects and use them instead of creating new connection.
+    engine : sqlalchemy.engine.base.Engine
+        The engine created by the table when it connects itself.
     date_column : str
         Name of the column in logging table which can be modified by application
         to write last write date.
@@ -661,7 +1438,11 @@ class Table(Branch):
         self.schema = None
         self.table = None
         self.db = None
+        self.engine = None
         self.date_column = None
+        self._external = False
+        self._url = None
+        self._inherited = None
         self._primary_key = None
         self._primary_key_column = None
 
@@ -728,15 +1509,18 @@ class Table(Branch):
         # Here is a creating of database connection.
         if isinstance(db, sql.engine.base.Connection) is True:
             self.db = db
+            self._external = True
         else:
             try:
                 if isinstance(db, sql.engine.base.Engine) is True:
                     self.db = db.connect()
+                    self._external = False
                 elif (host is not None or port is not None or
                       sid is not None or user is not None or
                       password is not None):
                     self.connect(password)
             except:
+                self.root.logger.metrics.count('failures', 'table')
                 self.root.logger.warning('Cannot connect to database')
                 self.root.logger.warning()
                 self._status = False
@@ -802,8 +1586,9 @@ class Table(Branch):
             credentials = f'{self.vendor}://{login}@{address}'
 
         # Connect to database.
-        engine = sql.create_engine(credentials)
-        self.db = engine.connect()
+        self.engine = sql.create_engine(credentials)
+        self.db = self.engine.connect()
+        self._external = False
         pass
 
     @you_shall_not_pass
@@ -829,6 +1614,35 @@ class Table(Branch):
         if hasattr(self, 'db') is True: self.db.close()
         pass
 
+    def release(self):
+        """Close connection to the database and dispose the engine created
+        by the table. Connection passed by the user is not closed.
+        """
+        with self._lock:
+            db, self.db = self.db, None
+            engine, self.engine = self.engine, None
+            self._url = None
+        if db is not None and self._external is False:
+            db.close()
+        if engine is not None:
+            engine.dispose()
+        pass
+
+    def _after_fork(self):
+        """Drop the connection inherited from the parent process. The new
+        one is opened by the first write from the child. Connection passed
+        by the user is kept as it is.
+        """
+        super()._after_fork()
+        if self.db is not None and self._external is False:
+            # Inherited objects are kept so they are never closed or
+            # returned to the pool by the child.
+            self._inherited = (self.db, self.engine)
+            self._url = self.db.engine.url
+            self.db = None
+            self.engine = None
+        pass
+
     @you_shall_not_pass
     def write(self, **values):
         """Write to logging table.
@@ -844,15 +1658,24 @@ class Table(Branch):
         """
         if self.date_column is not None:
             values[self.date_column] = dt.datetime.now()
-        if self._primary_key is None:
-            insert = self.proxy.insert().values(**values)
-            result = self.db.execute(insert)
-            self._primary_key = result.inserted_primary_key[0]
-        else:
-            update = self.proxy.update().\
-                values(**values).\
-                where(self._primary_key_column==self._primary_key)
-            self.db.execute(update)
+        try:
+            # Connection is opened again if it was dropped after the fork.
+            if self._url is not None:
+                url, self._url = self._url, None
+                self.engine = sql.create_engine(url)
+                self.db = self.engine.connect()
+            if self._primary_key is None:
+                insert = self.proxy.insert().values(**values)
+                result = self.db.execute(insert)
+                self._primary_key = result.inserted_primary_key[0]
+            else:
+                update = self.proxy.update().\
+                    values(**values).\
+                    where(self._primary_key_column==self._primary_key)
+                self.db.execute(update)
+        except:
+            self.root.logger.metrics.count('failures', 'table')
+            raise
         pass
 
     def _get_primary_key_column(self):
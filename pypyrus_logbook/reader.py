@@ -0,0 +1,303 @@
+import bisect
+import datetime as dt
+import json
+import os
+import time
+
+
+class Reader():
+    """This class represents reader - object that reads records back from the
+    output files of the logger.
+
+    Records are parsed into the forms according to the `Formatter.record`
+    template or loaded from JSON when output file is written in JSON Lines
+    format. Lines that can not be parsed are considered as a continuation of
+    the previous record message.
+
+    Parameters
+    ----------
+    file : File
+        The argument is used to set `file` attribute.
+
+    Attributes
+    ----------
+    file : File
+        The output `File` object which files must be read.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        pass
+
+    def search(self, start=None, end=None):
+        """Find records between two dates in all output files stored in the
+        `File.dir` folder.
+        For files with time index only the required part of file is read.
+        Other files are read completely. Records are indexed by their own
+        time but can be written a little later than the next bucket begins,
+        so one more bucket after the end is read.
+
+        Parameters
+        ----------
+        start : datetime.datetime, optional
+            The argument is used to define the earliest date of record.
+        end : datetime.datetime, optional
+            The argument is used to define the latest date of record.
+
+        Yields
+        ------
+        forms : dict
+            The forms of found record.
+        """
+        # Dates in text records have no fractions of second.
+        if start is not None:
+            start = start.replace(microsecond=0)
+        start_ts = start.timestamp() if start is not None else None
+        end_ts = end.timestamp() if end is not None else None
+        for path in self.list():
+            begin, stop = 0, None
+            width, index = self.load(path)
+            if len(index) > 0:
+                buckets = [bucket for bucket, offset in index]
+                # Skip files that do not intersect with requested dates.
+                if end_ts is not None and buckets[0] > end_ts:
+                    continue
+                if start_ts is not None \
+                and buckets[-1] + (width or 0) <= start_ts:
+                    continue
+                # Find the offsets of the first and last required buckets.
+                if start_ts is not None:
+                    i = bisect.bisect_right(buckets, start_ts) - 1
+                    begin = index[i][1] if i >= 0 else 0
+                if end_ts is not None:
+                    i = bisect.bisect_right(buckets, end_ts) + 1
+                    stop = index[i][1] if i < len(index) else None
+            for forms in self.read(path, begin, stop):
+                date = forms.get('datetime')
+                if date is None:
+                    continue
+                if start is not None and date < start:
+                    continue
+                if end is not None and date > end:
+                    continue
+                yield forms
+
+    def follow(self, interval=0.1, maxinterval=1.0, buffer=4096,
+               begin=False, quiet=0.5):
+        """Follow the current output file and yield new records as they are
+        appended.
+        File is read by small chunks. When there is no new data the reader
+        sleeps and the interval between the polls grows up to the maximum.
+        Text record can be continued by the next lines, e.g. traceback, so
+        the last record is yielded only when the next record begins or when
+        there is no new data during the quiet period.
+        When logger is restarted and `File.path` is switched then reader reads
+        the rest of the old file and continues with the new one.
+
+        Parameters
+        ----------
+        interval : float, optional
+            The argument is used to define the initial poll interval in
+            seconds. The default is 0.1.
+        maxinterval : float, optional
+            The argument is used to define the maximum poll interval in
+            seconds. The default is 1.
+        buffer : int, optional
+            The argument is used to define the size of read chunk in bytes.
+            The default is 4096.
+        begin : bool, optional
+            The argument is used to read the current file from the beginning
+            instead of its end. The default is False.
+        quiet : float, optional
+            The argument is used to define the time in seconds without new
+            data after which the last text record is complete. The default
+            is 0.5.
+
+        Yields
+        ------
+        forms : dict
+            The forms of the record.
+        """
+        path, fh = None, None
+        delay = interval
+        pending, forms = b'', None
+        received = time.monotonic()
+        try:
+            while True:
+                # Open the file when it is created by the first write.
+                if fh is None:
+                    path = self.file.path
+                    if os.path.exists(path) is False:
+                        time.sleep(delay)
+                        delay = min(delay*2, maxinterval)
+                        continue
+                    fh = open(path, 'rb')
+                    if begin is False:
+                        fh.seek(0, os.SEEK_END)
+                    begin = True
+                rotated = self.file.path != path
+                chunk = fh.read(buffer)
+                # Old file can end without the line break so its last line
+                # is completed before the switch.
+                if not chunk and rotated is True and pending:
+                    chunk = b'\n'
+                if chunk:
+                    delay = interval
+                    received = time.monotonic()
+                    lines = (pending + chunk).split(b'\n')
+                    pending = lines.pop()
+                    for line in lines:
+                        line = line.decode('utf-8', errors='replace') + '\n'
+                        parsed = self.parse(line)
+                        if parsed is not None:
+                            if forms is not None:
+                                yield forms
+                            forms = parsed
+                        elif forms is not None:
+                            message = forms.get('message', '')
+                            line = line.rstrip('\n')
+                            forms['message'] = f'{message}\n{line}'
+                    continue
+                # Last record is complete when nothing can continue it.
+                if forms is not None:
+                    if rotated is True or self.file.json is True \
+                    or time.monotonic() - received >= quiet:
+                        yield forms
+                        forms = None
+                # Old file is completely read so move to the new one.
+                if rotated is True:
+                    fh.close()
+                    fh, pending = None, b''
+                    continue
+                time.sleep(delay)
+                delay = min(delay*2, maxinterval)
+        finally:
+            if fh is not None:
+                fh.close()
+
+    def list(self):
+        """List all output files in the `File.dir` folder ordered by the time
+        of modification.
+
+        Returns
+        -------
+        paths : list of str
+            The paths to output files.
+        """
+        dir, ext = self.file.dir, f'.{self.file.ext}'
+        if os.path.exists(dir) is False:
+            return []
+        paths = [os.path.join(dir, name) for name in os.listdir(dir)
+                 if name.endswith(ext) is True]
+        paths.sort(key=os.path.getmtime)
+        return paths
+
+    def load(self, path):
+        """Load time index of the output file.
+        Index can have the same bucket several times and buckets out of
+        order when file is written by several processes. So buckets are
+        sorted and each of them gets the smallest offset, including offsets
+        of all later buckets, to never skip a record.
+
+        Parameters
+        ----------
+        path : str
+            The path to output file.
+
+        Returns
+        -------
+        width : int or None
+            The width of index bucket in seconds.
+        index : list of tuple
+            The list of pairs: bucket start timestamp and byte offset.
+        """
+        width, offsets = None, {}
+        path = f'{path}.idx'
+        if os.path.exists(path) is True:
+            with open(path, 'r') as fh:
+                for line in fh:
+                    key, value = line.split('\t')
+                    if key == 'width':
+                        width = int(value)
+                    else:
+                        key, value = int(key), int(value)
+                        offsets[key] = min(value, offsets.get(key, value))
+        index = []
+        for bucket in sorted(offsets, reverse=True):
+            offset = offsets[bucket]
+            if len(index) > 0:
+                offset = min(offset, index[-1][1])
+            index.append((bucket, offset))
+        index.reverse()
+        return width, index
+
+    def read(self, path, begin=0, stop=None):
+        """Read records from the output file.
+
+        Parameters
+        ----------
+        path : str
+            The path to output file.
+        begin : int, optional
+            The byte offset from which file must be read.
+        stop : int, optional
+            The byte offset on which reading must be stopped.
+
+        Yields
+        ------
+        forms : dict
+            The forms of the record.
+        """
+        with open(path, 'rb') as fh:
+            fh.seek(begin)
+            position = begin
+            forms = None
+            for line in fh:
+                if stop is not None and position >= stop:
+                    break
+                position += len(line)
+                line = line.decode('utf-8', errors='replace')
+                parsed = self.parse(line)
+                if parsed is not None:
+                    if forms is not None:
+                        yield forms
+                    forms = parsed
+                elif forms is not None:
+                    message = forms.get('message', '')
+                    line = line.rstrip('\n')
+                    forms['message'] = f'{message}\n{line}'
+            if forms is not None:
+                yield forms
+
+    def parse(self, line):
+        """Parse a single line of output file.
+
+        Parameters
+        ----------
+        line : str
+            The line of output file.
+
+        Returns
+        -------
+        forms : dict or None
+            The forms of the record or None if line is not a record. Line
+            with the date that can not be parsed is not a record too, e.g.
+            the line of traceback that looks like the record.
+        """
+        if self.file.json is True:
+            try:
+                forms = json.loads(line)
+            except ValueError:
+                return None
+            date = forms.get('datetime')
+        else:
+            forms = self.file.root.logger.formatter.parse(line)
+            if forms is None:
+                return None
+            date = forms.get('isodate') or forms.get('datetime')
+        if isinstance(date, str) is True:
+            try:
+                forms['datetime'] = dt.datetime.fromisoformat(date)
+            except ValueError:
+                return None
+        return forms
@@ -1,8 +1,135 @@
 import datetime as dt
+import json
+import math
 import os
 import sys
 import threading
 
+from json.encoder import encode_basestring
+
+# Folder of the module used to recognize its own frames.
+module_dir = os.path.dirname(__file__)
+# Cache of source files with flag whether file belongs to the module.
+module_files = {}
+
+# Pre-encoded JSON field names of the predefined record forms.
+json_datetime = '{"datetime":'
+json_rectype = ',"rectype":'
+json_objname = ',"objname":'
+json_flname = ',"flname":'
+json_thread = ',"thread":'
+json_message = ',"message":'
+# Cache of pre-encoded JSON field names of the user defined forms.
+json_keys = {}
+
+def _encode_float(value):
+    """Encode float value to JSON. NaN and infinity become null."""
+    return repr(value) if math.isfinite(value) is True else 'null'
+
+def _encode_datetime(value):
+    """Encode date or datetime value to JSON as ISO formatted string."""
+    return f'"{value.isoformat()}"'
+
+def _finite(value, path=frozenset()):
+    """Copy the container replacing NaN and infinity by None. Circular
+    reference raises ValueError.
+    """
+    if isinstance(value, float) is True:
+        return value if math.isfinite(value) is True else None
+    if isinstance(value, (dict, list, tuple)) is True:
+        if id(value) in path:
+            raise ValueError('Circular reference detected')
+        path = path | {id(value)}
+        if isinstance(value, dict) is True:
+            return {key: _finite(item, path) for key, item in value.items()}
+        return [_finite(item, path) for item in value]
+    return value
+
+def _encode_container(value):
+    """Encode dict, list or tuple to JSON. Unknown nested values become
+    strings and NaN and infinity become null as well as on the top level.
+    Container that cannot be presented in JSON, for example with tuple keys
+    or with circular reference, becomes a string as a whole.
+    """
+    try:
+        return json.dumps(value, ensure_ascii=False, default=str,
+                          allow_nan=False)
+    except ValueError:
+        # Most likely there are non-finite floats, otherwise the circular
+        # reference is found again.
+        try:
+            return json.dumps(_finite(value), ensure_ascii=False,
+                              default=str, allow_nan=False)
+        except (TypeError, ValueError):
+            return encode_basestring(str(value))
+    except TypeError:
+        return encode_basestring(str(value))
+
+json_encoders = {str: encode_basestring,
+                 int: int.__repr__,
+                 float: _encode_float,
+                 bool: lambda value: 'true' if value is True else 'false',
+                 type(None): lambda value: 'null',
+                 dt.datetime: _encode_datetime,
+                 dt.date: _encode_datetime,
+                 dict: _encode_container,
+                 list: _encode_container,
+                 tuple: _encode_container}
+
+def encode_value(value):
+    """Encode any value to JSON. Values of unknown types are encoded as
+    their string presentation.
+
+    Parameters
+    ----------
+    value : any
+        The value that must be encoded.
+
+    Returns
+    -------
+    value : str
+        JSON presentation of the value.
+    """
+    encoder = json_encoders.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    return encode_basestring(str(value))
+
+def catch_frame(frame=None):
+    """Catch the frame from file where methods of module was called.
+    Result of the file check is cached so walk costs only few dictionary
+    lookups.
+
+    Parameters
+    ----------
+    frame : frame, optional
+        The frame from which the walk must be started. By default it is the
+        frame of the caller.
+
+    Returns
+    -------
+    frame : frame
+        The first frame that does not belong to the module or the outermost
+        frame if there is no such one.
+    """
+    frame = frame or sys._getframe(1)
+    while True:
+        filename = frame.f_code.co_filename
+        internal = module_files.get(filename)
+        if internal is None:
+            internal = os.path.dirname(filename) == module_dir
+            module_files[filename] = internal
+        if internal is False or frame.f_back is None:
+            return frame
+        frame = frame.f_back
+
+def encode_key(key):
+    """Encode the name of the user defined form to JSON field name."""
+    try:
+        return json_keys[key]
+    except KeyError:
+        return json_keys.setdefault(key, f',{encode_basestring(key)}:')
+
 
 class Record():
     """This class describes the record. Record is an entity that is going to
@@ -16,6 +143,8 @@ class Record():
     which are the variablse that automatically defined by class during the
     instance construction. Second one is user defined forms which are passed
     to class constructor as kwargs.
+    Record is immutable and keeps only the values of the forms without any
+    reference to the logger, so buffered records are cheap to hold.
     List of predefined dynamic forms available by now:
 
     +---------+----------------------------------------------------+
@@ -31,10 +160,14 @@ class Record():
     +---------+----------------------------------------------------+
     |flname   |Script file name from which record was initiated    |
     +---------+----------------------------------------------------+
+    |lineno   |Line number from which record was initiated         |
+    +---------+----------------------------------------------------+
     |div      |Border element                                      |
     +---------+----------------------------------------------------+
     |message  |Input text message                                  |
     +---------+----------------------------------------------------+
+    |thread   |Name of the thread from which record was initiated  |
+    +---------+----------------------------------------------------+
 
     Parameters
     ----------
@@ -46,6 +179,7 @@ class Record():
         Input message that must be printed with that record.
     error : bool, optional
         That is True or False to indicate that record include error information.
+        Error record without message uses `Formatter.error` as a message.
     format : str, optional
         String template of the whole record.
     error_format : str or bool, optional
@@ -55,36 +189,116 @@ class Record():
         and message formatting.
     """
 
+    __slots__ = ('_format', '_rectype', '_datetime', '_isodate', '_objname',
+                 '_flname', '_lineno', '_thread', '_div', '_message',
+                 '_forms', '_string')
+
     def __init__(self, logger, rectype, message, error=False, format=None,
                  error_format=None, **kwargs):
-        self.logger = logger
-        # Get the record string template.
-        self.format = format or logger.formatter.record
-        # Get the presentation of record type.
-        self.rectype = logger.rectypes[rectype]
-
         # Date forms.
-        self.datetime = dt.datetime.now()
-        self.isodate = self.datetime.isoformat(sep=' ', timespec='seconds')
+        datetime = dt.datetime.now()
+        isodate = datetime.isoformat(sep=' ', timespec='seconds')
 
         # Execution forms.
-        frame = self.__catch_frame()
+        frame = catch_frame()
         f_code = frame.f_code
-        flname = f_code.co_filename
         objname = f_code.co_name
-        self.objname = objname if objname != '<module>' else 'main'
-        self.flname = os.path.splitext(os.path.basename(flname))[0]
-        self.thread = threading.current_thread().name
+        objname = objname if objname != '<module>' else 'main'
+        flname = os.path.splitext(os.path.basename(f_code.co_filename))[0]
+        thread = threading.current_thread().name
+
+        if error is True and message is None:
+            message = logger.formatter.error
+        self.__fill(logger, format, rectype, datetime, isodate, objname,
+                    flname, frame.f_lineno, thread, message, kwargs)
+        pass
+
+    @classmethod
+    def restore(cls, logger, timestamp, rectype, message, kwargs, code,
+                lineno, thread, cache=None):
+        """Create the record from the raw fields captured earlier.
+        Date strings and names taken from code objects are stored in the
+        cache so records rendered together share them.
+
+        Parameters
+        ----------
+        logger : Logger
+            That is a Logger object that owns the output for that record.
+        timestamp : int
+            The time of the record in nanoseconds since the epoch.
+        rectype : str
+            Name of the record type item from the Logger.rectypes dictionary.
+        message : str
+            Input message that must be printed with that record.
+        kwargs : dict
+            The user defined forms.
+        code : code
+            The code object from which record was initiated.
+        lineno : int
+            The line number from which record was initiated.
+        thread : str
+            The name of the thread from which record was initiated.
+        cache : dict, optional
+            The dictionary shared by the records rendered together.
+
+        Returns
+        -------
+        record : Record
+            The `Record` object.
+        """
+        cache = {} if cache is None else cache
+
+        # Date forms. Date string is changed only once per second.
+        seconds = timestamp // 1000000000
+        datetime = dt.datetime.fromtimestamp(timestamp / 1e9)
+        isodate = cache.get(seconds)
+        if isodate is None:
+            isodate = cache[seconds] = datetime.isoformat(sep=' ',
+                                                          timespec='seconds')
+
+        # Execution forms.
+        names = cache.get(code)
+        if names is None:
+            objname = code.co_name
+            objname = objname if objname != '<module>' else 'main'
+            flname = os.path.splitext(os.path.basename(code.co_filename))[0]
+            names = cache[code] = (objname, flname)
+        objname, flname = names
+
+        self = cls.__new__(cls)
+        self.__fill(logger, None, rectype, datetime, isodate, objname, flname,
+                    lineno, thread, message, kwargs)
+        return self
 
-        # Styling forms.
-        self.div = logger.formatter.div
+    def __fill(self, logger, format, rectype, datetime, isodate, objname,
+               flname, lineno, thread, message, kwargs):
+        """Set all attributes of the new record. Only the values are kept so
+        record does not refer to the logger.
+        """
+        self._format = format or logger.formatter.record
+        self._rectype = rectype = logger.rectypes.get(rectype, rectype)
+        self._datetime = datetime
+        self._isodate = isodate
+        self._objname = objname
+        self._flname = flname
+        self._lineno = lineno
+        self._thread = thread
+        self._div = div = logger.formatter.div
 
         # Store formatted message as instance attribute.
-        message = str(message if error is False else logger.formatter.error)
+        message = str(message)
         try:
-            self.message = message.format(**self.__dict__, **kwargs)
+            message = message.format(rectype=rectype, datetime=datetime,
+                                     isodate=isodate, objname=objname,
+                                     flname=flname, lineno=lineno,
+                                     thread=thread, div=div, **kwargs)
         except KeyError:
-            self.message = message
+            pass
+        self._message = message
+
+        # Store user defined forms for serialization.
+        self._forms = kwargs
+        self._string = None
         pass
 
     def __str__(self):
@@ -92,17 +306,87 @@ class Record():
 
     __repr__ = __str__
 
+    @property
+    def rectype(self):
+        """Type of the record."""
+        return self._rectype
+
+    @property
+    def datetime(self):
+        """Datetime object at the time of record construction."""
+        return self._datetime
+
+    @property
+    def isodate(self):
+        """Date string form of the time of record construction."""
+        return self._isodate
+
+    @property
+    def objname(self):
+        """Name of the object from which record was initiated."""
+        return self._objname
+
+    @property
+    def flname(self):
+        """Script file name from which record was initiated."""
+        return self._flname
+
+    @property
+    def lineno(self):
+        """Line number from which record was initiated."""
+        return self._lineno
+
+    @property
+    def thread(self):
+        """Name of the thread from which record was initiated."""
+        return self._thread
+
+    @property
+    def div(self):
+        """Border element."""
+        return self._div
+
+    @property
+    def message(self):
+        """Formatted message."""
+        return self._message
+
+    @property
+    def forms(self):
+        """User defined forms."""
+        return self._forms
+
+    @property
+    def format(self):
+        """String template of the whole record."""
+        return self._format
+
     def create(self, css=False):
         """Create and return string representation of the record."""
-        string = self.format.format(**self.__dict__)
+        # String is created only once even if record is sent to several
+        # outputs.
+        string = self._string
+        if string is None:
+            string = self._string = self._format.format(
+                rectype=self._rectype, datetime=self._datetime,
+                isodate=self._isodate, objname=self._objname,
+                flname=self._flname, lineno=self._lineno,
+                thread=self._thread, div=self._div, message=self._message)
         return string
 
-    def __catch_frame(self):
-        """Catch the frame from file where methods of module was called."""
-        frame = sys._getframe()
-        module_dir = os.path.dirname(__file__)
-        while True:
-            if module_dir != os.path.dirname(frame.f_code.co_filename):
-                return frame
-            else:
-                frame = frame.f_back
+    def serialize(self):
+        """Create and return JSON Lines representation of the record.
+        Predefined forms and user defined forms are written as JSON fields.
+        Values that cannot be presented in JSON are written as strings.
+        """
+        items = [json_datetime, _encode_datetime(self._datetime),
+                 json_rectype, encode_basestring(self._rectype),
+                 json_objname, encode_basestring(self._objname),
+                 json_flname, encode_basestring(self._flname),
+                 json_thread, encode_basestring(self._thread),
+                 json_message, encode_basestring(self._message)]
+        for key, value in self._forms.items():
+            items.append(encode_key(key))
+            items.append(encode_value(value))
+        items.append('}\n')
+        return ''.join(items)
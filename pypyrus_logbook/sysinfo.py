@@ -7,9 +7,37 @@ import pip
 import platform
 import socket
 import sys
+import threading
 
 # Path to user JSON file with parameters.
 userprms = os.path.abspath(os.path.expanduser('~/.pypyrus/prms.json'))
+# Content of user JSON file cached by the time of its modification.
+userprms_cache = {'mtime': None, 'items': []}
+
+def read_userprms():
+    """Read user JSON file with parameters. File is parsed again only when
+    its time of modification is changed.
+
+    Returns
+    -------
+    mtime : int or None
+        The time of file modification in nanoseconds or None if there is no
+        file.
+    items : list
+        The list of parameters from file.
+    """
+    try:
+        mtime = os.stat(userprms).st_mtime_ns
+    except OSError:
+        mtime, items = None, []
+    else:
+        if mtime == userprms_cache['mtime']:
+            return mtime, userprms_cache['items']
+        with open(userprms, 'r') as fh:
+            items = json.load(fh)
+    userprms_cache['mtime'] = mtime
+    userprms_cache['items'] = items
+    return mtime, items
 
 class Dataset(dict):
     """Parent class for dataset objects.
@@ -68,6 +96,9 @@ class Descriptors():
     |pip         |Information about PIP                             |
     +------------+--------------------------------------------------+
 
+    Descriptors are found only when they are requested for the first time,
+    so e.g. DNS lookup for the IP address is done only if it is needed.
+
     Parameters
     ----------
     *args
@@ -78,17 +109,15 @@ class Descriptors():
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._hostname = platform.node()
-        self._ip = socket.gethostbyname(socket.gethostname())
-        self._user = os.getlogin()
-        self._pid = os.getpid()
-        self._system = platform.platform()
-        self._python = '-'.join([f'{platform.python_version()}',
-                                 f'{platform.architecture()[0]}'])
-        self._compiler = platform.python_compiler()
+        self._hostname = None
+        self._ip = None
+        self._user = None
+        self._system = None
+        self._python = None
+        self._compiler = None
         self._interpreter = sys.executable
         self._script = os.path.abspath(sys.argv[0])
-        self._pip = pip.__version__
+        self._pip = None
         pass
 
     def __str__(self):
@@ -112,36 +141,49 @@ class Descriptors():
     @property
     def hostname(self):
         """Name of the host on which scipt is running."""
+        if self._hostname is None:
+            self._hostname = platform.node()
         return self._hostname
 
     @property
     def ip(self):
         """IP address of the host on which script is running."""
+        if self._ip is None:
+            self._ip = socket.gethostbyname(socket.gethostname())
         return self._ip
 
     @property
     def user(self):
         """Name of user who is running the script."""
+        if self._user is None:
+            self._user = os.getlogin()
         return self._user
 
     @property
     def pid(self):
         """OS PID which covers the script execution."""
-        return self._pid
+        return os.getpid()
 
     @property
     def system(self):
         """Name of the OS."""
+        if self._system is None:
+            self._system = platform.platform()
         return self._system
 
     @property
     def python(self):
         """Version of used Python."""
+        if self._python is None:
+            self._python = '-'.join([f'{platform.python_version()}',
+                                     f'{platform.architecture()[0]}'])
         return self._python
 
     @property
     def compiler(self):
         """Information of used compiler."""
+        if self._compiler is None:
+            self._compiler = platform.python_compiler()
         return self._compiler
 
     @property
@@ -157,6 +199,8 @@ class Descriptors():
     @property
     def pip(self):
         """Information about PIP."""
+        if self._pip is None:
+            self._pip = pip.__version__
         return self._pip
 
     @property
@@ -207,15 +251,33 @@ class Sysinfo():
     Take into account that dataset item names are all lower cased no matter
     what was in original source.
 
+    Usually there is one Sysinfo object per process with datasets shared by
+    all loggers that can be got with `Sysinfo.shared()`. Each logger has its
+    own Sysinfo object on top of it. Datasets are read only when they are
+    requested for the first time. Descriptors and environment variables are
+    always taken from the shared object. Flag arguments, parameters and
+    anons are taken from it too until `Sysinfo.add()` is called, then the
+    object gets its own argument parser, so flags of one logger never
+    appear in another one.
+
     Parameters
     ----------
-    logger: Logger
+    logger : Logger, optional
         The argument is used to set `logger` attribute.
+    base : Sysinfo, optional
+        The argument is used to set `base` attribute.
 
     Attributes
     ----------
-    logger : Logger
-        Logger which reads the datasets from that Sysinfo object.
+    logger : Logger or None
+        Logger that owns that Sysinfo object. It is None for the shared
+        object.
+    base : Sysinfo or None
+        The object with shared datasets. It is None for the shared object
+        itself.
+    argparser : argparse.ArgumentParser
+        The parser of the flag arguments. It is created by the first call of
+        `Sysinfo.add()` or when it is requested.
     args : argparser.Namespace
         Recognized flag arguments.
     desc : Descriptors
@@ -228,15 +290,103 @@ class Sysinfo():
         Unrecognized flag and execution arguments.
     """
 
-    def __init__(self, logger):
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, logger=None, base=None):
         self.logger = logger
-        self.argparser = argparse.ArgumentParser()
-        self.args = None
-        self.desc = Descriptors()
-        self.prms = Parameters()
-        self.env = Environment()
-        self.anons = []
-        self.read(args=True, user=True, env=True)
+        self.base = base
+        self._argparser = None
+        self._args = None
+        self._desc = None
+        self._prms = Parameters()
+        self._env = None
+        self._anons = []
+        self._parsed = False
+        self._userkeys = set()
+        self._mtime = None
+        pass
+
+    @classmethod
+    def shared(cls):
+        """Get the Sysinfo object shared by all loggers of the process.
+
+        Returns
+        -------
+        sysinfo : Sysinfo
+            The shared `Sysinfo` object.
+        """
+        if cls._shared is None:
+            with cls._lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @property
+    def argparser(self):
+        """The parser of the flag arguments."""
+        if self._argparser is None:
+            self._argparser = argparse.ArgumentParser()
+        return self._argparser
+
+    @property
+    def args(self):
+        """Recognized flag arguments."""
+        source = self.__source()
+        source.__load()
+        return source._args
+
+    @property
+    def desc(self):
+        """Instance of Descriptors class."""
+        if self.base is not None:
+            return self.base.desc
+        if self._desc is None:
+            self._desc = Descriptors()
+        return self._desc
+
+    @property
+    def prms(self):
+        """Instance of Parameters class."""
+        source = self.__source()
+        source.__load()
+        return source._prms
+
+    @property
+    def env(self):
+        """Instance of Environment class."""
+        if self.base is not None:
+            return self.base.env
+        if self._env is None:
+            env = Environment()
+            for key, value in os.environ.items():
+                env[key.lower()] = value
+            self._env = env
+        return self._env
+
+    @property
+    def anons(self):
+        """Unrecognized flag and execution arguments."""
+        source = self.__source()
+        source.__load()
+        return source._anons
+
+    def __source(self):
+        """Get the object which owns flag arguments, parameters and anons."""
+        if self._argparser is None and self.base is not None:
+            return self.base
+        return self
+
+    def __load(self):
+        """Read execution arguments when they are requested for the first
+        time or after new arguments were added. Read user parameters again if
+        the file was modified.
+        """
+        mtime, items = read_userprms()
+        if self._parsed is False or mtime != self._mtime:
+            with self._lock:
+                self.read(args=self._parsed is False, user=True)
+                self._parsed = True
         pass
 
     def __str__(self):
@@ -257,44 +407,57 @@ class Sysinfo():
             The argument is used to read environment variables. Default is
             False.
         """
+        source = self.__source()
+        if source is not self:
+            source.read(args=args, user=user, env=env)
+            return
         if args is True:
             # Parse all arguments from execution.
             knowns, unknowns = self.argparser.parse_known_args()
             # All known arguments on this read become Sysyinfo.args.
-            self.args = knowns
+            self._args = knowns
             # Clear anons because between previous and current read unknown
             # argumnts could be added to parser.
-            self.anons.clear()
+            self._anons.clear()
             # If value can not be parsed then it puts to Sysinfo.anons.
             # In other case it puts to Sysinfo.prms.
             for item in unknowns:
                 try:
                     key, value = item.split('=')
                 except ValueError:
-                    self.anons.append(item)
+                    self._anons.append(item)
                 else:
                     key = key.lower()
                     value = self._validate_value(value)
-                    self.prms[key] = value
+                    self._prms[key] = value
         if user is True:
-            if os.path.exists(userprms) is True:
-                with open(userprms, 'r') as fh:
-                    for item in json.load(fh):
-                        if isinstance(item, dict) is True:
-                            name = item.get('name')
-                            if (isinstance(name, str) is True and
-                                self.prms.get(name) is None):
-                                    key = name.lower()
-                                    value = item.get('value')
-                                    self.prms[key] = value
+            mtime, items = read_userprms()
+            if mtime != self._mtime:
+                self._mtime = mtime
+                # Parameters from the old version of file are replaced.
+                for key in self._userkeys:
+                    self._prms.pop(key, None)
+                self._userkeys.clear()
+                for item in items:
+                    if isinstance(item, dict) is True:
+                        name = item.get('name')
+                        if (isinstance(name, str) is True and
+                            self._prms.get(name) is None):
+                                key = name.lower()
+                                value = item.get('value')
+                                self._prms[key] = value
+                                self._userkeys.add(key)
         if env is True:
-            for key, value in os.environ.items():
-                key = key.lower()
-                self.env[key] = value
+            if self.base is not None:
+                self.base._env = None
+            self._env = None
         pass
 
     def add(self, *args, **kwargs):
         """Shorcut for argparse.ArgumentParser.add_argument() method.
+        Execution arguments are parsed again only when they are requested so
+        many arguments can be added one by one with a single parse at the
+        end. Arguments are added only to the own parser of that object.
 
         Parameters
         ----------
@@ -304,7 +467,7 @@ class Sysinfo():
             The keyword arguments is used for `argparser.add_argument()`.
         """
         self.argparser.add_argument(*args, **kwargs)
-        self.read()
+        self._parsed = False
         pass
 
     def _validate_value(self, value):
@@ -0,0 +1,140 @@
+import concurrent.futures
+import queue
+import sys
+import threading
+import traceback
+
+from .record import Record
+
+
+class Writer():
+    """This class represents writer - background thread that performs the
+    blocking work of the logger: file and console output, emails and database
+    updates.
+
+    Records are put to the queue by the callers and written by the writer
+    thread in the same order. Other tasks are put to the same queue as the
+    functions and return the future so caller can wait for the result
+    without blocking.
+
+    Queue is drained in batches. Records can be put as tuples of raw fields
+    captured by the caller. Such records are rendered by the writer with the
+    logger that made them, so child loggers keep their own record types, and
+    records of one batch share the cache of date strings and names.
+
+    Parameters
+    ----------
+    logger : Logger
+        The argument is used to set `logger` attribute.
+
+    Attributes
+    ----------
+    logger : Logger
+        The `Logger` object which records are written.
+    queue : queue.SimpleQueue
+        The queue of pending records and tasks.
+    thread : threading.Thread
+        The writer thread.
+    batch : int
+        The maximum number of items taken from the queue at once.
+    """
+
+    batch = 256
+
+    def __init__(self, logger):
+        self.logger = logger
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.__run,
+                                       name=f'LogbookWriter-{logger.name}',
+                                       daemon=True)
+        self._running = True
+        self.thread.start()
+        pass
+
+    @property
+    def pending(self):
+        """Approximate number of pending records and tasks."""
+        return self.queue.qsize()
+
+    def write(self, record):
+        """Put the record to the queue.
+
+        Parameters
+        ----------
+        record : str, Record or tuple
+            The record that must be written to the output. Tuple must contain
+            the arguments of `Record.restore()` starting with the logger.
+        """
+        self.queue.put((None, record))
+        pass
+
+    def call(self, func, *args, **kwargs):
+        """Put the function to the queue.
+
+        Parameters
+        ----------
+        func : callable
+            The function that must be executed by the writer thread.
+        *args
+            The positional arguments of the function.
+        **kwargs
+            The keyword arguments of the function.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            The future with the result of the function.
+        """
+        future = concurrent.futures.Future()
+        self.queue.put((future, (func, args, kwargs)))
+        return future
+
+    def stop(self):
+        """Stop the writer after all pending records and tasks are done.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            The future that is done when writer is stopped.
+        """
+        return self.call(self.__stop)
+
+    def __stop(self):
+        self._running = False
+        pass
+
+    def __run(self):
+        """Execute records and tasks from the queue until writer is stopped.
+        Records put by other threads after the stop are also written.
+        """
+        logger = self.logger
+        while True:
+            items = []
+            try:
+                items.append(self.queue.get(block=self._running))
+                while len(items) < self.batch:
+                    items.append(self.queue.get_nowait())
+            except queue.Empty:
+                if len(items) == 0:
+                    break
+            cache = {}
+            for future, value in items:
+                if future is None:
+                    try:
+                        if isinstance(value, tuple) is True:
+                            rectype = value[2]
+                            value = Record.restore(*value, cache=cache)
+                            logger.metrics.count('records', rectype)
+                        logger._write(value)
+                    except Exception:
+                        # Writer must survive the failed output.
+                        traceback.print_exc(file=sys.stderr)
+                elif future.set_running_or_notify_cancel() is True:
+                    func, args, kwargs = value
+                    try:
+                        result = func(*args, **kwargs)
+                    except Exception as error:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(result)
+        pass